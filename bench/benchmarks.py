@@ -0,0 +1,252 @@
+import sys
+import json
+import argparse
+import platform
+import tempfile
+import statistics
+from decimal import Decimal
+import numpy as np
+import pandas as pd
+from time import perf_counter
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from src.coverage import Coverage
+from src.manager import OHLCVManager
+from src.model import OHLCVBatch
+from src.moralis_api import MoralisAPI
+from src.timeframe import Timeframe
+from src.warehouse import OHLCVWarehouse
+
+from .fake_moralis import FakeMoralisServer, make_result
+
+PAIR = "bench_pair"
+BASE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+NS = 1_000_000_000
+
+
+def _measure(
+    name: str,
+    func: Callable[[], Any],
+    rows: int,
+    repeat: int,
+    setup: Optional[Callable[[], Any]] = None
+) -> Dict[str, Any]:
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = perf_counter()
+        func()
+        timings.append(perf_counter() - started)
+    best = min(timings)
+    result = {
+        "name": name,
+        "rows": rows,
+        "repeat": repeat,
+        "best_s": best,
+        "median_s": statistics.median(timings),
+        "rows_per_s": rows / best if best > 0 else None,
+    }
+    print(
+        f"{name:<32} {best * 1000:>10.2f} ms  {rows:>10} rows",
+        file=sys.stderr
+    )
+    return result
+
+
+def _make_batch(rows: int, step: int) -> OHLCVBatch:
+    start = int(BASE.timestamp()) * NS
+    timestamps = start + np.arange(rows, dtype=np.int64) * step * NS
+    values = np.linspace(1.0, 2.0, rows)
+    return OHLCVBatch(timestamps, values, values, values, values, values)
+
+
+def _moralis_api(server: FakeMoralisServer) -> MoralisAPI:
+    api = MoralisAPI(api_key="bench")
+    api._BASE_URL = server.base_url
+    return api
+
+
+def bench_parse(scale: float, repeat: int) -> List[Dict[str, Any]]:
+    rows = MoralisAPI.MAX_LIMIT
+    start = int(BASE.timestamp()) * NS
+    payload = json.dumps({"result": make_result(
+        start + np.arange(rows, dtype=np.int64) * 60 * NS
+    )})
+    api = MoralisAPI(api_key="bench")
+    results = [
+        _measure(
+            "parse.decode_float64",
+            lambda: api._decode_result(json.loads(payload), True),
+            rows, repeat
+        ),
+        _measure(
+            "parse.decode_decimal",
+            lambda: api._to_models(api._decode_result(
+                json.loads(payload, parse_float=Decimal), False
+            )),
+            rows, repeat
+        ),
+    ]
+
+    with FakeMoralisServer() as server, _moralis_api(server) as api:
+        end = BASE + timedelta(minutes=rows - 1)
+        results.append(_measure(
+            "parse.get_ohlcv_data_http",
+            lambda: api.get_ohlcv_data(
+                PAIR, Timeframe.MIN1, "usd", BASE, end, limit=rows
+            ),
+            rows, repeat
+        ))
+    return results
+
+
+def bench_gap_detect(scale: float, repeat: int) -> List[Dict[str, Any]]:
+    rows = max(10, int(86_400 * scale))
+    start = int(BASE.timestamp()) * NS
+    coverage = Coverage(
+        (start + i * NS, start + (i + 5) * NS) for i in range(0, rows, 10)
+    )
+    end = start + rows * NS
+    results = [_measure(
+        "gap_detect.coverage_missing_s1",
+        lambda: coverage.missing(start, end), rows, repeat
+    )]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        warehouse = OHLCVWarehouse(Path(tmp))
+        warehouse._write_coverage(
+            warehouse._coverage_path(PAIR, Timeframe.S1), coverage
+        )
+        results.append(_measure(
+            "gap_detect.warehouse_missing_s1",
+            lambda: warehouse.missing_spans(
+                PAIR, Timeframe.S1, BASE, BASE + timedelta(seconds=rows)
+            ),
+            rows, repeat
+        ))
+    return results
+
+
+def bench_warehouse(scale: float, repeat: int) -> List[Dict[str, Any]]:
+    rows = max(1, int(1_000_000 * scale))
+    batch = _make_batch(rows, 1)
+    end = BASE + timedelta(seconds=rows)
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp)
+
+        def reset() -> None:
+            for partition in path.glob("**/*.ohlcv"):
+                partition.unlink()
+
+        warehouse = OHLCVWarehouse(path)
+        results.append(_measure(
+            "warehouse.store",
+            lambda: warehouse.store_ohlcv_data(PAIR, Timeframe.S1, batch),
+            rows, repeat, setup=reset
+        ))
+        results.append(_measure(
+            "warehouse.load",
+            lambda: warehouse.load_ohlcv_data(PAIR, Timeframe.S1, BASE, end),
+            rows, repeat
+        ))
+        mapped = OHLCVWarehouse(path, mmap=True)
+        results.append(_measure(
+            "warehouse.load_mmap",
+            lambda: mapped.load_ohlcv_data(PAIR, Timeframe.S1, BASE, end),
+            rows, repeat
+        ))
+    return results
+
+
+def bench_end_to_end(scale: float, repeat: int) -> List[Dict[str, Any]]:
+    rows = max(1, int(10_000 * scale))
+    end = BASE + timedelta(minutes=rows - 1)
+    results = []
+
+    with FakeMoralisServer() as server, _moralis_api(server) as api, \
+            tempfile.TemporaryDirectory() as tmp:
+        state: Dict[str, OHLCVManager] = {}
+        runs = iter(range(repeat))
+
+        def fresh_manager() -> None:
+            if "manager" in state:
+                state["manager"].close()
+            directory = Path(tmp) / f"run{next(runs)}"
+            state["manager"] = OHLCVManager(api, OHLCVWarehouse(directory))
+
+        results.append(_measure(
+            "end_to_end.cold",
+            lambda: state["manager"].get_ohlcv_data(
+                PAIR, Timeframe.MIN1, BASE, end
+            ),
+            rows, repeat, setup=fresh_manager
+        ))
+        results.append(_measure(
+            "end_to_end.warm",
+            lambda: state["manager"].get_ohlcv_data(
+                PAIR, Timeframe.MIN1, BASE, end
+            ),
+            rows, repeat
+        ))
+        state["manager"].close()
+    return results
+
+
+BENCHMARKS: Dict[str, Callable[[float, int], List[Dict[str, Any]]]] = {
+    "parse": bench_parse,
+    "gap_detect": bench_gap_detect,
+    "warehouse": bench_warehouse,
+    "end_to_end": bench_end_to_end,
+}
+
+
+def run(
+    names: List[str], scale: float = 1.0, repeat: int = 5
+) -> Dict[str, Any]:
+    results: List[Dict[str, Any]] = []
+    for name in names:
+        results.extend(BENCHMARKS[name](scale, repeat))
+    return {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "scale": scale,
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench.benchmarks")
+    parser.add_argument("benchmarks", nargs="*")
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args(argv)
+
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(
+            f"unknown benchmarks: {', '.join(sorted(unknown))} "
+            f"(choose from {', '.join(BENCHMARKS)})"
+        )
+    if args.scale <= 0 or args.repeat < 1:
+        parser.error("--scale must be > 0 and --repeat >= 1")
+
+    report = run(args.benchmarks or list(BENCHMARKS), args.scale, args.repeat)
+    text = json.dumps(report, indent=2)
+    if args.output is not None:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
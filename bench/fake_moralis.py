@@ -0,0 +1,101 @@
+import json
+import threading
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+from urllib.parse import parse_qs, urlparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.timeframe import Timeframe
+
+_SECONDS = {
+    timeframe.label: int(round(timeframe.minutes * 60))
+    for timeframe in Timeframe
+}
+
+
+def _timestamp_ns(value: str) -> int:
+    ts = pd.Timestamp(value)
+    ts = ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+    return int(ts.value)
+
+
+def make_result(timestamps_ns: np.ndarray) -> List[Dict[str, Any]]:
+    phase = timestamps_ns // 1_000_000_000 % 3600 / 3600 * 2 * np.pi
+    close = 100 + 10 * np.sin(phase)
+    labels = pd.DatetimeIndex(
+        timestamps_ns.view("datetime64[ns]")
+    ).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    return [
+        {
+            "timestamp": label,
+            "open": round(c - 0.5, 6),
+            "high": round(c + 1.0, 6),
+            "low": round(c - 1.0, 6),
+            "close": round(c, 6),
+            "volume": round(1000 + c, 6),
+        }
+        for label, c in zip(labels, close.tolist())
+    ]
+
+
+@lru_cache(maxsize=4096)
+def _page(
+    label: str, from_date: str, to_date: str, limit: int, offset: int
+) -> Tuple[bytes, int]:
+    step = _SECONDS[label] * 1_000_000_000
+    first = -(-_timestamp_ns(from_date) // step) * step
+    last = _timestamp_ns(to_date) // step * step
+    newest = last - offset * step
+    count = max(0, min(limit, (newest - first) // step + 1))
+    timestamps = newest - np.arange(count, dtype=np.int64) * step
+    remaining = count > 0 and timestamps[-1] - step >= first
+    payload: Dict[str, Any] = {"result": make_result(timestamps)}
+    if remaining:
+        payload["cursor"] = str(offset + count)
+    return json.dumps(payload).encode(), count
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        query = {
+            key: values[0]
+            for key, values in parse_qs(urlparse(self.path).query).items()
+        }
+        body, _ = _page(
+            query["timeframe"], query["fromDate"], query["toDate"],
+            int(query.get("limit", 100)), int(query.get("cursor", 0))
+        )
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class FakeMoralisServer:
+    def __init__(self) -> None:
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}/pairs"
+
+    def __enter__(self) -> "FakeMoralisServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
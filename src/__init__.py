@@ -1,11 +1,23 @@
-
 import pandas
+import threading
 from datetime import datetime
+from typing import Dict, Iterable, Optional, Union
 
 from .manager import OHLCVManager
 from .timeframe import Timeframe
 
-__all__ = ["get_ohlcv_data", "OHLCVManager"]
+__all__ = ["get_ohlcv_data", "get_ohlcv_data_many", "OHLCVManager"]
+
+_default_manager: Optional[OHLCVManager] = None
+_default_manager_lock = threading.Lock()
+
+
+def _get_default_manager() -> OHLCVManager:
+    global _default_manager
+    with _default_manager_lock:
+        if _default_manager is None:
+            _default_manager = OHLCVManager()
+        return _default_manager
 
 
 def get_ohlcv_data(
@@ -14,5 +26,16 @@ def get_ohlcv_data(
     start: datetime,
     end: datetime
 ) -> pandas.DataFrame:
-    manager = OHLCVManager()
+    manager = _get_default_manager()
     return manager.get_ohlcv_data(pair, timeframe, start, end)
+
+
+def get_ohlcv_data_many(
+    pairs: Iterable[str],
+    timeframe: Timeframe,
+    start: datetime,
+    end: datetime,
+    as_frame: bool = False
+) -> Union[Dict[str, pandas.DataFrame], pandas.DataFrame]:
+    manager = _get_default_manager()
+    return manager.get_ohlcv_data_many(pairs, timeframe, start, end, as_frame)
@@ -1,8 +1,13 @@
-
+import random
 import logging
-from time import sleep
+import inspect
+from time import monotonic, sleep
+from asyncio import sleep as async_sleep
 from functools import wraps
-from typing import Callable, TypeVar, ParamSpec
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional, TypeVar, ParamSpec, cast
 
 P = ParamSpec("P")
 R = TypeVar("R")
@@ -10,44 +15,151 @@ R = TypeVar("R")
 logger = logging.getLogger(__name__)
 
 
+def _status_of(e: Exception) -> Optional[int]:
+    status = getattr(e, "status", None)
+    if status is None:
+        status = getattr(getattr(e, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _headers_of(e: Exception) -> Any:
+    headers = getattr(e, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(e, "response", None), "headers", None)
+    return headers
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    delay: float = 1
+    retries: int = 4
+    max_delay: float = float("inf")
+    deadline: Optional[float] = None
+    jitter: bool = False
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.delay, (int, float)) or self.delay < 0:
+            raise ValueError(
+                f"Invalid delay {self.delay!r}: must be a non-negative number."
+            )
+        if not isinstance(self.retries, int) or self.retries < 1:
+            raise ValueError(
+                f"Invalid retries {self.retries!r}: must be an integer >= 1."
+            )
+        if not isinstance(self.max_delay, (int, float)) or self.max_delay < 0:
+            raise ValueError(
+                f"Invalid max_delay {self.max_delay!r}: "
+                "must be a non-negative number."
+            )
+        if self.deadline is not None and (
+            not isinstance(self.deadline, (int, float)) or self.deadline <= 0
+        ):
+            raise ValueError(
+                f"Invalid deadline {self.deadline!r}: "
+                "must be a positive number or None."
+            )
+
+    def is_retryable(self, e: Exception) -> bool:
+        if isinstance(e, ValueError):
+            return False
+        status = _status_of(e)
+        if status is None:
+            return True
+        return status == 429 or status >= 500
+
+    def retry_after(self, e: Exception) -> Optional[float]:
+        headers = _headers_of(e)
+        value = headers.get("Retry-After") if headers is not None else None
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            pass
+        try:
+            when = parsedate_to_datetime(str(value))
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+    def next_delay(self, attempt: int, e: Exception) -> float:
+        retry_after = self.retry_after(e)
+        if retry_after is not None:
+            return retry_after
+        delay = min(self.max_delay, self.delay * 2 ** (attempt - 1))
+        return random.uniform(0, delay) if self.jitter else delay
+
+
 def backoff(
     delay: int = 1,
     retries: int = 4,
+    policy: Optional[RetryPolicy] = None,
 ) -> Callable[[Callable[P, R]], Callable[P, R]]:
-    if not isinstance(delay, (int, float)) or delay < 0:
-        raise ValueError(
-            f"Invalid delay {delay!r}: must be a non-negative number."
-        )
-    if not isinstance(retries, int) or retries < 1:
-        raise ValueError(
-            f"Invalid retries {retries!r}: must be an integer >= 1."
+    retry_policy = policy or RetryPolicy(delay=delay, retries=retries)
+
+    def next_delay(
+        func: Callable[..., Any], attempt: int, started: float, e: Exception
+    ) -> float:
+        name = func.__name__
+        if not retry_policy.is_retryable(e):
+            logger.error(f"{name} failed with a non-retryable error: {e}")
+            raise e
+        if attempt >= retry_policy.retries:
+            logger.error(
+                f"{name} failed after {retry_policy.retries} "
+                f"retries. Last error: {e}"
+            )
+            raise e
+
+        current_delay = retry_policy.next_delay(attempt, e)
+        deadline = retry_policy.deadline
+        if deadline is not None and (
+            monotonic() - started + current_delay > deadline
+        ):
+            logger.error(
+                f"{name} failed and the next retry would exceed the "
+                f"{deadline} second deadline. Last error: {e}"
+            )
+            raise e
+
+        logger.warning(
+            f"{name} failed (attempt "
+            f"{attempt}/{retry_policy.retries}): {e}. "
+            f"Retrying in {current_delay} seconds..."
         )
+        return current_delay
 
     def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> Any:
+                started = monotonic()
+                attempt = 0
+                while attempt < retry_policy.retries:
+                    try:
+                        return await func(*args, **kwargs)
+                    except Exception as e:
+                        attempt += 1
+                        await async_sleep(
+                            next_delay(func, attempt, started, e)
+                        )
+                raise RuntimeError(
+                    f"{func.__name__} did not complete or raise as expected"
+                )
+            return cast(Callable[P, R], async_wrapper)
+
         @wraps(func)
         def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
-            current_retry = 0
-            current_delay = delay
-            while current_retry < retries:
+            started = monotonic()
+            attempt = 0
+            while attempt < retry_policy.retries:
                 try:
                     return func(*args, **kwargs)
-                except ValueError:
-                    raise
                 except Exception as e:
-                    current_retry += 1
-                    if current_retry >= retries:
-                        logger.error(
-                            f"{func.__name__} failed after {retries} "
-                            f"retries. Last error: {e}"
-                        )
-                        raise
-                    logger.warning(
-                        f"{func.__name__} failed (attempt "
-                        f"{current_retry}/{retries}): {e}. "
-                        f"Retrying in {current_delay} seconds..."
-                    )
-                    sleep(current_delay)
-                    current_delay *= 2
+                    attempt += 1
+                    sleep(next_delay(func, attempt, started, e))
             raise RuntimeError(
                 f"{func.__name__} did not complete or raise as expected"
             )
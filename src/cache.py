@@ -0,0 +1,120 @@
+import logging
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from .model import OHLCVBatch
+from .timeframe import Timeframe
+
+logger = logging.getLogger(__name__)
+
+_Key = Tuple[str, Timeframe]
+_Segment = Tuple[str, Timeframe, int, int]
+
+
+def _nbytes(batch: OHLCVBatch) -> int:
+    return batch.timestamps.nbytes + sum(
+        column.nbytes for column in batch.columns
+    )
+
+
+class OHLCVCache:
+    def __init__(self, max_bytes: int):
+        if not isinstance(max_bytes, int) or max_bytes < 1:
+            raise ValueError(
+                f"Invalid max_bytes {max_bytes!r}: must be an integer >= 1."
+            )
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._segments: "OrderedDict[_Segment, OHLCVBatch]" = OrderedDict()
+        self._generations: Dict[_Key, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._segments)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def generation(self, pair: str, timeframe: Timeframe) -> int:
+        with self._lock:
+            return self._generations.get((pair, timeframe), 0)
+
+    def get(
+        self, pair: str, timeframe: Timeframe, start: int, end: int
+    ) -> Optional[OHLCVBatch]:
+        with self._lock:
+            for segment, batch in self._segments.items():
+                if segment[:2] != (pair, timeframe):
+                    continue
+                if segment[2] <= start and end <= segment[3]:
+                    self._segments.move_to_end(segment)
+                    timestamps = batch.timestamps
+                    lo = int(np.searchsorted(timestamps, start, side="left"))
+                    hi = int(np.searchsorted(timestamps, end, side="right"))
+                    return batch[lo:hi].copy()
+        return None
+
+    def put(
+        self,
+        pair: str,
+        timeframe: Timeframe,
+        start: int,
+        end: int,
+        batch: OHLCVBatch,
+        generation: int
+    ) -> None:
+        with self._lock:
+            if self._generations.get((pair, timeframe), 0) != generation:
+                return
+
+            parts = [batch.copy()]
+            batch_start, batch_end = start, end
+            for segment in list(self._segments):
+                if segment[:2] != (pair, timeframe):
+                    continue
+                if segment[3] + 1 < start or end + 1 < segment[2]:
+                    continue
+                cached = self._pop(segment)
+                outside = (cached.timestamps < batch_start) | (
+                    cached.timestamps > batch_end
+                )
+                parts.append(cached[outside])
+                start, end = min(start, segment[2]), max(end, segment[3])
+
+            merged = OHLCVBatch.concat(parts)
+            merged = merged[np.argsort(merged.timestamps, kind="stable")]
+            self._segments[(pair, timeframe, start, end)] = merged
+            self._bytes += _nbytes(merged)
+
+            while self._bytes > self._max_bytes and self._segments:
+                segment, evicted = self._segments.popitem(last=False)
+                self._bytes -= _nbytes(evicted)
+                logger.debug(
+                    f"Evicted cached {segment[0]} {segment[1].name} segment "
+                    f"of {len(evicted)} rows."
+                )
+
+    def invalidate(
+        self, pair: str, timeframe: Timeframe, start: int, end: int
+    ) -> None:
+        with self._lock:
+            key = (pair, timeframe)
+            self._generations[key] = self._generations.get(key, 0) + 1
+            for segment in list(self._segments):
+                if segment[:2] == key and (
+                    segment[2] <= end and start <= segment[3]
+                ):
+                    self._pop(segment)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._segments.clear()
+            self._bytes = 0
+
+    def _pop(self, segment: _Segment) -> OHLCVBatch:
+        batch = self._segments.pop(segment)
+        self._bytes -= _nbytes(batch)
+        return batch
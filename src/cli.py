@@ -0,0 +1,260 @@
+import os
+import sys
+import json
+import logging
+import argparse
+from time import monotonic
+from pathlib import Path
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Set, TextIO, Tuple
+
+from .manager import OHLCVManager
+from .moralis_api import MoralisAPI
+from .rate_limiter import RateLimiter
+from .timeframe import Timeframe
+from .warehouse import OHLCVWarehouse
+
+logger = logging.getLogger(__name__)
+
+_Window = Tuple[str, str, str, str]
+
+
+def _parse_timeframe(value: str) -> Timeframe:
+    for timeframe in Timeframe:
+        if value in (timeframe.name, timeframe.label):
+            return timeframe
+    raise argparse.ArgumentTypeError(
+        f"Invalid timeframe {value!r}: must be one of "
+        f"{', '.join(timeframe.name for timeframe in Timeframe)}."
+    )
+
+
+def _parse_datetime(value: str) -> datetime:
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Invalid datetime {value!r}: must be ISO 8601."
+        )
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def _read_pairs(path: Path) -> List[str]:
+    with open(path) as f:
+        lines = (line.split("#", 1)[0].strip() for line in f)
+        return [line for line in lines if line]
+
+
+@dataclass(frozen=True)
+class BackfillJob:
+    pairs: Tuple[str, ...]
+    timeframes: Tuple[Timeframe, ...]
+    start: datetime
+    end: datetime
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "pairs": list(self.pairs),
+            "timeframes": [timeframe.name for timeframe in self.timeframes],
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+        }
+
+
+class Checkpoint:
+    def __init__(self, path: Path, job: BackfillJob):
+        self._path = Path(path)
+        self._job = job.to_dict()
+        self.completed: Set[_Window] = set()
+        self.candles = 0
+        self.requests = 0
+
+    def load(self) -> bool:
+        if not self._path.exists():
+            return False
+        with open(self._path) as f:
+            state = json.load(f)
+        if state.get("job") != self._job:
+            raise ValueError(
+                f"Checkpoint {self._path} belongs to a different job; "
+                "pass --restart to discard it."
+            )
+        self.completed = {tuple(window) for window in state["completed"]}
+        self.candles = int(state["candles"])
+        self.requests = int(state["requests"])
+        return True
+
+    def save(self) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path.with_name(f"{self._path.name}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "job": self._job,
+                "completed": sorted(self.completed),
+                "candles": self.candles,
+                "requests": self.requests,
+            }, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._path)
+
+    def discard(self) -> None:
+        if self._path.exists():
+            self._path.unlink()
+
+
+def _window_key(
+    pair: str, timeframe: Timeframe, start: datetime, end: datetime
+) -> _Window:
+    return (pair, timeframe.name, start.isoformat(), end.isoformat())
+
+
+def run_backfill(
+    manager: OHLCVManager,
+    job: BackfillJob,
+    checkpoint: Checkpoint,
+    workers: int = 4,
+    out: TextIO = sys.stderr
+) -> int:
+    plan = [
+        (pair, timeframe, window_start, window_end)
+        for pair in job.pairs
+        for timeframe in job.timeframes
+        for window_start, window_end in manager.plan_gaps(
+            pair, timeframe, job.start, job.end
+        )
+        if _window_key(pair, timeframe, window_start, window_end)
+        not in checkpoint.completed
+    ]
+    print(f"Planned {len(plan)} windows.", file=out, flush=True)
+
+    started = monotonic()
+    requests_before = manager.requests_sent
+    requests_base = checkpoint.requests
+    candles = 0
+    done = 0
+    failed = 0
+
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="ohlcv-backfill"
+    ) as executor:
+        futures: Dict[Future, Tuple[str, Timeframe, datetime, datetime]] = {
+            executor.submit(manager.fill_gap, *window): window
+            for window in plan
+        }
+        try:
+            for future in as_completed(futures):
+                pair, timeframe, window_start, window_end = futures[future]
+                try:
+                    count = future.result()
+                except Exception as e:
+                    failed += 1
+                    logger.error(
+                        f"Backfill of {pair} {timeframe.name} from "
+                        f"{window_start} to {window_end} failed: {e}"
+                    )
+                    continue
+
+                done += 1
+                candles += count
+                checkpoint.completed.add(
+                    _window_key(pair, timeframe, window_start, window_end)
+                )
+                requests = manager.requests_sent - requests_before
+                checkpoint.candles += count
+                checkpoint.requests = requests_base + requests
+                checkpoint.save()
+
+                elapsed = max(monotonic() - started, 1e-9)
+                print(
+                    f"[{done}/{len(plan)}] {candles} candles, "
+                    f"{candles / elapsed:.1f} candles/s, "
+                    f"{requests / elapsed:.1f} requests/s",
+                    file=out, flush=True
+                )
+        except KeyboardInterrupt:
+            for pending in futures:
+                pending.cancel()
+            print("Interrupted; progress is checkpointed.", file=out)
+            raise
+
+    if failed:
+        print(f"{failed} windows failed; rerun to retry.", file=out)
+        return 1
+    checkpoint.discard()
+    return 0
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="ohlcv")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backfill = commands.add_parser(
+        "backfill", help="Backfill OHLCV data into the warehouse."
+    )
+    backfill.add_argument("--pairs", nargs="+", default=[])
+    backfill.add_argument("--pairs-file", type=Path)
+    backfill.add_argument(
+        "--timeframes", nargs="+", type=_parse_timeframe, required=True
+    )
+    backfill.add_argument("--start", type=_parse_datetime, required=True)
+    backfill.add_argument("--end", type=_parse_datetime, required=True)
+    backfill.add_argument("--db-path", type=Path, default=Path("data/ohlcv"))
+    backfill.add_argument("--checkpoint", type=Path)
+    backfill.add_argument("--restart", action="store_true")
+    backfill.add_argument("--workers", type=int, default=4)
+    backfill.add_argument("--in-flight", type=int, default=4)
+    backfill.add_argument("--rate", type=float)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    pairs = list(args.pairs)
+    if args.pairs_file is not None:
+        pairs.extend(_read_pairs(args.pairs_file))
+    if not pairs:
+        parser.error("at least one pair is required")
+    if args.end < args.start:
+        parser.error("--end must not be before --start")
+    if args.workers < 1 or args.in_flight < 1:
+        parser.error("--workers and --in-flight must be >= 1")
+
+    job = BackfillJob(
+        tuple(dict.fromkeys(pairs)), tuple(dict.fromkeys(args.timeframes)),
+        args.start, args.end
+    )
+    checkpoint = Checkpoint(
+        args.checkpoint or args.db_path / "backfill.checkpoint.json", job
+    )
+    if args.restart:
+        checkpoint.discard()
+    try:
+        if checkpoint.load():
+            print(
+                f"Resuming: {len(checkpoint.completed)} windows already "
+                "done.", file=sys.stderr
+            )
+    except ValueError as e:
+        parser.error(str(e))
+
+    rate_limiter = RateLimiter(args.rate) if args.rate else None
+    with MoralisAPI(rate_limiter=rate_limiter) as moralis_api:
+        manager = OHLCVManager(
+            moralis_api,
+            OHLCVWarehouse(args.db_path),
+            max_workers=args.workers,
+            max_in_flight=args.in_flight
+        )
+        try:
+            return run_backfill(manager, job, checkpoint, args.workers)
+        except KeyboardInterrupt:
+            return 130
+        finally:
+            manager.close()
@@ -0,0 +1,60 @@
+import numpy as np
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List, Tuple
+
+
+class Coverage:
+    def __init__(self, intervals: Iterable[Tuple[int, int]] = ()):
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        for start, end in sorted(intervals):
+            self.add(start, end)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    @property
+    def intervals(self) -> List[Tuple[int, int]]:
+        return list(zip(self._starts, self._ends))
+
+    def add(self, start: int, end: int) -> None:
+        if end <= start:
+            return
+
+        lo = bisect_left(self._ends, start)
+        hi = bisect_right(self._starts, end)
+        if lo < hi:
+            start = min(start, self._starts[lo])
+            end = max(end, self._ends[hi - 1])
+
+        self._starts[lo:hi] = [start]
+        self._ends[lo:hi] = [end]
+
+    def missing(self, start: int, end: int) -> List[Tuple[int, int]]:
+        spans: List[Tuple[int, int]] = []
+        if end <= start:
+            return spans
+
+        cursor = start
+        i = bisect_right(self._ends, start)
+        while i < len(self._starts) and self._starts[i] < end:
+            if self._starts[i] > cursor:
+                spans.append((cursor, self._starts[i]))
+            cursor = max(cursor, self._ends[i])
+            i += 1
+
+        if cursor < end:
+            spans.append((cursor, end))
+        return spans
+
+    def to_array(self) -> np.ndarray:
+        return np.array(
+            [self._starts, self._ends], dtype=np.int64
+        ).T.reshape(-1, 2)
+
+    @classmethod
+    def from_array(cls, array: np.ndarray) -> "Coverage":
+        coverage = cls()
+        coverage._starts = [int(start) for start in array[:, 0]]
+        coverage._ends = [int(end) for end in array[:, 1]]
+        return coverage
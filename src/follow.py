@@ -0,0 +1,133 @@
+import logging
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, List, Optional
+
+from .model import OHLCVBatch
+from .timeframe import Timeframe
+
+if TYPE_CHECKING:
+    from .manager import OHLCVManager
+
+logger = logging.getLogger(__name__)
+
+
+def _to_ns(dt: datetime) -> int:
+    return int(pd.Timestamp(dt).value)
+
+
+class _RingBuffer:
+    def __init__(self, capacity: int):
+        self._capacity = capacity
+        self._head = 0
+        self._size = 0
+        self._timestamps = np.zeros(2 * capacity, dtype=np.int64)
+        self._columns: List[np.ndarray] = [
+            np.zeros(2 * capacity, dtype=np.float64)
+            for _ in OHLCVBatch.COLUMNS
+        ]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def view(self) -> OHLCVBatch:
+        window = slice(self._head, self._head + self._size)
+        return OHLCVBatch(
+            self._timestamps[window],
+            *(column[window] for column in self._columns)
+        )
+
+    def truncate_from(self, timestamp: int) -> None:
+        timestamps = self.view().timestamps
+        self._size = int(np.searchsorted(timestamps, timestamp, side="left"))
+
+    def drop_before(self, timestamp: int) -> None:
+        timestamps = self.view().timestamps
+        count = int(np.searchsorted(timestamps, timestamp, side="left"))
+        self._head = (self._head + count) % self._capacity
+        self._size -= count
+
+    def extend(self, batch: OHLCVBatch) -> None:
+        batch = batch[-self._capacity:]
+        count = len(batch)
+        if not count:
+            return
+        positions = (
+            self._head + self._size + np.arange(count)
+        ) % self._capacity
+        for target, source in zip(
+            [self._timestamps, *self._columns],
+            [batch.timestamps, *batch.columns]
+        ):
+            target[positions] = source
+            target[positions + self._capacity] = source
+        overflow = max(0, self._size + count - self._capacity)
+        self._head = (self._head + overflow) % self._capacity
+        self._size = min(self._size + count, self._capacity)
+
+
+class OHLCVFollower:
+    def __init__(
+        self,
+        manager: "OHLCVManager",
+        pair: str,
+        timeframe: Timeframe,
+        window: timedelta
+    ):
+        if not isinstance(window, timedelta) or window < timeframe.timedelta:
+            raise ValueError(
+                f"Invalid window {window!r}: must be a timedelta of at "
+                f"least one {timeframe.label} candle."
+            )
+        self._manager = manager
+        self._pair = pair
+        self._timeframe = timeframe
+        self._window = window
+        self._ring = _RingBuffer(window // timeframe.timedelta + 1)
+        self._next_start: Optional[datetime] = None
+
+    @property
+    def pair(self) -> str:
+        return self._pair
+
+    @property
+    def timeframe(self) -> Timeframe:
+        return self._timeframe
+
+    def _update(self, now: datetime) -> int:
+        if self._next_start is None:
+            batch = OHLCVBatch.from_frame(self._manager.get_ohlcv_data(
+                self._pair, self._timeframe, now - self._window, now
+            ))
+        else:
+            batch = self._manager._fetch_ohlcv_data(
+                self._pair, self._timeframe, self._next_start, now
+            )
+            if (np.diff(batch.timestamps) < 0).any():
+                batch = batch[np.argsort(batch.timestamps, kind="stable")]
+            if len(batch):
+                self._ring.truncate_from(int(batch.timestamps[0]))
+
+        self._ring.extend(batch)
+        return len(batch)
+
+    def poll(self, copy: bool = True) -> pd.DataFrame:
+        now = datetime.now(timezone.utc)
+        updated = self._update(now)
+
+        forming = self._manager._floor(self._timeframe, now)
+        self._ring.drop_before(_to_ns(now - self._window))
+        self._next_start = forming
+        if len(self._ring):
+            newest = self._ring.view().max_timestamp()
+            self._next_start = min(
+                forming, newest + self._timeframe.timedelta
+            )
+
+        logger.debug(
+            f"Follow poll for {self._pair} {self._timeframe.label}: "
+            f"{updated} candles updated, {len(self._ring)} in window."
+        )
+        batch = self._ring.view()
+        return (batch.copy() if copy else batch).to_pandas()
@@ -1,13 +1,20 @@
 
+import asyncio
 import logging
+import threading
 import pandas as pd
-from typing import Optional, List, Tuple
+from functools import partial
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, Optional, List, Tuple, Union
 from datetime import datetime, timedelta, timezone
 
+from .cache import OHLCVCache
 from .warehouse import OHLCVWarehouse
-from .moralis_api import MoralisAPI
+from .moralis_api import MoralisAPI, AsyncMoralisAPI
 from .timeframe import Timeframe
-from .model import OHLCVData
+from .model import OHLCVBatch
+from .follow import OHLCVFollower
+from .resample import resample_batch, resample_sources
 
 logger = logging.getLogger(__name__)
 
@@ -16,34 +23,131 @@ class OHLCVManager:
     def __init__(
         self,
         moralis_api: Optional[MoralisAPI] = None,
-        ohlcv_warehouse: Optional[OHLCVWarehouse] = None
+        ohlcv_warehouse: Optional[OHLCVWarehouse] = None,
+        async_moralis_api: Optional[AsyncMoralisAPI] = None,
+        settle_horizon: timedelta = timedelta(hours=1),
+        max_workers: int = 4,
+        max_in_flight: int = 4,
+        resample: bool = False,
+        cache_bytes: int = 0,
+        max_page_size: int = MoralisAPI.MAX_LIMIT
     ):
+        if not isinstance(max_workers, int) or max_workers < 1:
+            raise ValueError(
+                f"Invalid max_workers {max_workers!r}: "
+                "must be an integer >= 1."
+            )
+        if not isinstance(max_in_flight, int) or max_in_flight < 1:
+            raise ValueError(
+                f"Invalid max_in_flight {max_in_flight!r}: "
+                "must be an integer >= 1."
+            )
+        if not isinstance(cache_bytes, int) or cache_bytes < 0:
+            raise ValueError(
+                f"Invalid cache_bytes {cache_bytes!r}: "
+                "must be an integer >= 0."
+            )
+        if not isinstance(max_page_size, int) or max_page_size < 1:
+            raise ValueError(
+                f"Invalid max_page_size {max_page_size!r}: "
+                "must be an integer >= 1."
+            )
+        self._owns_moralis_api = moralis_api is None
         self._moralis_api = moralis_api or MoralisAPI()
         self._ohlcv_warehouse = ohlcv_warehouse or OHLCVWarehouse()
+        self._async_moralis_api = async_moralis_api
+        self._settle_horizon = settle_horizon
+        self._resample = resample
+        self._max_page_size = max_page_size
+        self._max_in_flight = max_in_flight
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+        self._async_in_flight: Optional[
+            Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]
+        ] = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ohlcv-fetch"
+        )
+        self._pending: Dict[
+            Tuple[str, Timeframe], List[Tuple[datetime, datetime, Future]]
+        ] = {}
+        self._pending_lock = threading.Lock()
+        self._requests_sent = 0
+        self._requests_lock = threading.Lock()
+        self._cache: Optional[OHLCVCache] = None
+        if cache_bytes:
+            self._cache = OHLCVCache(cache_bytes)
+            self._ohlcv_warehouse.add_store_listener(self._cache.invalidate)
 
-    def _timestamps_to_spans(
-        self, missing: pd.DatetimeIndex, delta: timedelta
-    ) -> List[Tuple[datetime, datetime]]:
-        spans: List[Tuple[datetime, datetime]] = []
-        if missing.empty:
-            return spans
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        if self._cache is not None:
+            self._ohlcv_warehouse.remove_store_listener(
+                self._cache.invalidate
+            )
+            self._cache.clear()
+            self._cache = None
+        if self._owns_moralis_api:
+            self._moralis_api.close()
+
+    async def aclose(self) -> None:
+        self.close()
+        if self._async_moralis_api is not None:
+            await self._async_moralis_api.close()
 
-        span_start = prev = missing[0]
+    @property
+    def requests_sent(self) -> int:
+        return self._requests_sent
 
-        for ts in missing[1:]:
-            if ts - prev == delta:
-                prev = ts
-                continue
+    def _count_request(self) -> None:
+        with self._requests_lock:
+            self._requests_sent += 1
 
-            spans.append(
-                (span_start.to_pydatetime(), (prev + delta).to_pydatetime())
+    def _get_async_moralis_api(self) -> AsyncMoralisAPI:
+        if self._async_moralis_api is None:
+            self._async_moralis_api = AsyncMoralisAPI()
+        return self._async_moralis_api
+
+    def _get_async_in_flight(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if (
+            self._async_in_flight is None
+            or self._async_in_flight[0] is not loop
+        ):
+            self._async_in_flight = (
+                loop, asyncio.Semaphore(self._max_in_flight)
             )
-            span_start = prev = ts
+        return self._async_in_flight[1]
+
+    def _floor(self, timeframe: Timeframe, dt: datetime) -> datetime:
+        step = pd.Timedelta(timeframe.timedelta).value
+        value = pd.Timestamp(self._to_utc(dt)).value
+        return pd.Timestamp(value // step * step, tz="UTC").to_pydatetime()
 
-        spans.append(
-            (span_start.to_pydatetime(), (prev + delta).to_pydatetime())
+    def _ceil(self, timeframe: Timeframe, dt: datetime) -> datetime:
+        floor = self._floor(timeframe, dt)
+        return floor if floor == dt else floor + timeframe.timedelta
+
+    def _bucket_bounds(
+        self, timeframe: Timeframe, start: datetime, end: datetime
+    ) -> Tuple[datetime, datetime]:
+        return (
+            self._floor(timeframe, start),
+            self._floor(timeframe, end) + timeframe.timedelta
         )
-        return spans
+
+    def _covered_end(
+        self, timeframe: Timeframe, gap_end: datetime, data: OHLCVBatch
+    ) -> datetime:
+        now = datetime.now(timezone.utc)
+        settled = self._floor(timeframe, now - self._settle_horizon)
+        covered = min(gap_end, settled)
+        if len(data):
+            newest = data.max_timestamp()
+            forming = self._floor(timeframe, now)
+            covered = max(
+                covered, min(gap_end, newest + timeframe.timedelta, forming)
+            )
+        return covered
 
     def _to_utc(self, dt: datetime) -> datetime:
         return (
@@ -51,81 +155,477 @@ class OHLCVManager:
             else dt.astimezone(timezone.utc)
         )
 
+    def _next_to_date(
+        self, timeframe: Timeframe, data: OHLCVBatch, to_date: datetime
+    ) -> Optional[datetime]:
+        if not len(data):
+            logger.info("No data received; exiting loop.")
+            return None
+
+        oldest_timestamp = data.min_timestamp()
+        if oldest_timestamp >= to_date:
+            logger.warning(
+                "No progress in pagination; breaking to prevent loop."
+            )
+            return None
+        return oldest_timestamp - timedelta(minutes=timeframe.minutes)
+
+    def _page_limit(
+        self, timeframe: Timeframe, from_date: datetime, to_date: datetime
+    ) -> int:
+        candles = (to_date - from_date) // timeframe.timedelta + 1
+        return max(1, min(self._max_page_size, candles))
+
+    def _next_page(
+        self,
+        timeframe: Timeframe,
+        data: OHLCVBatch,
+        to_date: datetime,
+        limit: int,
+        cursor: Optional[str],
+        next_cursor: Optional[str]
+    ) -> Tuple[Optional[datetime], Optional[str]]:
+        if next_cursor is not None and len(data):
+            if next_cursor == cursor:
+                logger.warning(
+                    "Cursor did not advance; breaking to prevent loop."
+                )
+                return None, None
+            return to_date, next_cursor
+        if len(data) and len(data) < limit:
+            logger.info("Received a partial page; range exhausted.")
+            return None, None
+        return self._next_to_date(timeframe, data, to_date), None
+
+    def _split_span(
+        self, timeframe: Timeframe, start: datetime, end: datetime
+    ) -> List[Tuple[datetime, datetime]]:
+        window = timeframe.timedelta * self._max_page_size
+        spans = []
+        while end - start > window:
+            spans.append((start, start + window))
+            start += window
+        spans.append((start, end))
+        return spans
+
     def _fetch_ohlcv_data(
         self, pair: str, timeframe: Timeframe, start: datetime, end: datetime
-    ) -> List[OHLCVData]:
+    ) -> OHLCVBatch:
         from_date = self._to_utc(start)
-        to_date = self._to_utc(end)
+        to_date: Optional[datetime] = self._to_utc(end)
 
-        all_data = []
+        cursor: Optional[str] = None
+
+        all_data: List[OHLCVBatch] = []
         count = 0
 
-        while True:
+        while to_date is not None:
             if to_date < from_date:
                 logger.info("Reached the lower date limit; exiting loop.")
                 break
 
             count += 1
+            limit = self._page_limit(timeframe, from_date, to_date)
 
             logger.debug(
                 f"Fetching OHLCV data from {from_date.isoformat()} "
                 f"to {to_date.isoformat()} (iteration {count})"
             )
 
-            data = self._moralis_api.get_ohlcv_data(
-                pair_address=pair,
-                timeframe=timeframe.value,
-                currency="usd",
-                from_date=from_date,
-                to_date=to_date
+            with self._in_flight:
+                data, next_cursor = self._moralis_api.get_ohlcv_page(
+                    pair_address=pair,
+                    timeframe=timeframe,
+                    currency="usd",
+                    from_date=from_date,
+                    to_date=to_date,
+                    limit=limit,
+                    cursor=cursor
+                )
+                self._count_request()
+
+            all_data.append(data)
+            to_date, cursor = self._next_page(
+                timeframe, data, to_date, limit, cursor, next_cursor
             )
 
-            if not data:
-                logger.info("No data received; exiting loop.")
+        batch = OHLCVBatch.concat(all_data)
+        logger.info(
+            f"Total data points fetched: {len(batch)}, iterations: {count}"
+        )
+
+        return batch
+
+    async def _afetch_ohlcv_data(
+        self, pair: str, timeframe: Timeframe, start: datetime, end: datetime
+    ) -> OHLCVBatch:
+        from_date = self._to_utc(start)
+        to_date: Optional[datetime] = self._to_utc(end)
+        moralis_api = self._get_async_moralis_api()
+        in_flight = self._get_async_in_flight()
+
+        cursor: Optional[str] = None
+
+        all_data: List[OHLCVBatch] = []
+        count = 0
+
+        while to_date is not None:
+            if to_date < from_date:
+                logger.info("Reached the lower date limit; exiting loop.")
                 break
 
-            all_data.extend(data)
+            count += 1
+            limit = self._page_limit(timeframe, from_date, to_date)
 
-            oldest_timestamp = min(item.timestamp for item in data)
-            if oldest_timestamp >= to_date:
-                logger.warning(
-                    "No progress in pagination; breaking to prevent loop."
+            logger.debug(
+                f"Fetching OHLCV data from {from_date.isoformat()} "
+                f"to {to_date.isoformat()} (iteration {count})"
+            )
+
+            async with in_flight:
+                data, next_cursor = await moralis_api.get_ohlcv_page(
+                    pair_address=pair,
+                    timeframe=timeframe,
+                    currency="usd",
+                    from_date=from_date,
+                    to_date=to_date,
+                    limit=limit,
+                    cursor=cursor
+                )
+                self._count_request()
+
+            all_data.append(data)
+            to_date, cursor = self._next_page(
+                timeframe, data, to_date, limit, cursor, next_cursor
+            )
+
+        batch = OHLCVBatch.concat(all_data)
+        logger.info(
+            f"Total data points fetched: {len(batch)}, iterations: {count}"
+        )
+
+        return batch
+
+    def _commit_gap(
+        self, pair: str, timeframe: Timeframe,
+        gap_start: datetime, gap_end: datetime, chunk: OHLCVBatch
+    ) -> None:
+        if len(chunk):
+            self._ohlcv_warehouse.store_ohlcv_data(
+                pair=pair, timeframe=timeframe, data=chunk)
+        else:
+            logger.info(
+                f"No data for {pair} between {gap_start} and {gap_end}."
+            )
+
+        covered_end = self._covered_end(timeframe, gap_end, chunk)
+        if covered_end > gap_start:
+            self._ohlcv_warehouse.mark_covered(
+                pair, timeframe, gap_start, covered_end
+            )
+
+    def _fill_gap(
+        self, pair: str, timeframe: Timeframe,
+        gap_start: datetime, gap_end: datetime
+    ) -> int:
+        logger.debug(f"Filling gap for {pair}: {gap_start} -> {gap_end}")
+        chunk = self._fetch_ohlcv_data(
+            pair, timeframe, gap_start, gap_end - timeframe.timedelta
+        )
+        self._commit_gap(pair, timeframe, gap_start, gap_end, chunk)
+        return len(chunk)
+
+    async def _afill_gap(
+        self, pair: str, timeframe: Timeframe,
+        gap_start: datetime, gap_end: datetime
+    ) -> None:
+        logger.debug(f"Filling gap for {pair}: {gap_start} -> {gap_end}")
+        chunk = await self._afetch_ohlcv_data(
+            pair, timeframe, gap_start, gap_end - timeframe.timedelta
+        )
+        await asyncio.to_thread(
+            self._commit_gap, pair, timeframe, gap_start, gap_end, chunk
+        )
+
+    def _derive_span(
+        self, pair: str, source: Timeframe, timeframe: Timeframe,
+        span_start: datetime, span_end: datetime
+    ) -> None:
+        fine = OHLCVBatch.from_frame(self._load(
+            pair, source, span_start, span_end - source.timedelta
+        ))
+        coarse = resample_batch(fine, timeframe)
+        logger.debug(
+            f"Derived {len(coarse)} {timeframe.label} candles for {pair} "
+            f"from {len(fine)} {source.label} candles."
+        )
+        if len(coarse):
+            self._ohlcv_warehouse.store_ohlcv_data(
+                pair=pair, timeframe=timeframe, data=coarse)
+        self._ohlcv_warehouse.mark_covered(
+            pair, timeframe, span_start, span_end
+        )
+
+    def _resample_gap(
+        self, pair: str, source: Timeframe, timeframe: Timeframe,
+        gap_start: datetime, gap_end: datetime
+    ) -> List[Tuple[datetime, datetime]]:
+        missing = self._ohlcv_warehouse.missing_spans(
+            pair, source, gap_start, gap_end
+        )
+        derived: List[Tuple[datetime, datetime]] = []
+        cursor = gap_start
+        for missing_start, missing_end in [*missing, (gap_end, gap_end)]:
+            span_start = self._ceil(timeframe, cursor)
+            span_end = self._floor(timeframe, missing_start)
+            if span_end > span_start:
+                self._derive_span(
+                    pair, source, timeframe, span_start, span_end
                 )
+                derived.append((span_start, span_end))
+            cursor = max(cursor, missing_end)
+
+        remaining: List[Tuple[datetime, datetime]] = []
+        cursor = gap_start
+        for span_start, span_end in derived:
+            if span_start > cursor:
+                remaining.append((cursor, span_start))
+            cursor = span_end
+        if gap_end > cursor:
+            remaining.append((cursor, gap_end))
+        return remaining
+
+    def _resample_gaps(
+        self, timeframe: Timeframe,
+        gaps: List[Tuple[str, datetime, datetime]]
+    ) -> List[Tuple[str, datetime, datetime]]:
+        for source in resample_sources(timeframe):
+            if not gaps:
                 break
-            new_to_date = oldest_timestamp - timedelta(
-                minutes=timeframe.minutes
+            gaps = [
+                (pair, *remaining)
+                for pair, gap_start, gap_end in gaps
+                for remaining in self._resample_gap(
+                    pair, source, timeframe, gap_start, gap_end
+                )
+            ]
+        return gaps
+
+    def _load(
+        self, pair: str, timeframe: Timeframe, start: datetime, end: datetime
+    ) -> pd.DataFrame:
+        cache = self._cache
+        if cache is None:
+            return self._ohlcv_warehouse.load_ohlcv_data(
+                pair, timeframe, start, end
             )
 
-            to_date = new_to_date
+        start_ns = pd.Timestamp(self._to_utc(start)).value
+        end_ns = pd.Timestamp(self._to_utc(end)).value
+        cached = cache.get(pair, timeframe, start_ns, end_ns)
+        if cached is not None:
+            return cached.to_pandas()
 
-        logger.info(
-            f"Total data points fetched: {len(all_data)}, iterations: {count}"
+        generation = cache.generation(pair, timeframe)
+        frame = self._ohlcv_warehouse.load_ohlcv_data(
+            pair, timeframe, start, end
         )
+        cache.put(
+            pair, timeframe, start_ns, end_ns,
+            OHLCVBatch.from_frame(frame), generation
+        )
+        return frame
 
-        return all_data
+    def _missing_spans(
+        self, pair: str, timeframe: Timeframe, start: datetime, end: datetime
+    ) -> List[Tuple[datetime, datetime]]:
+        span_start, span_end = self._bucket_bounds(timeframe, start, end)
+        return self._ohlcv_warehouse.missing_spans(
+            pair, timeframe, span_start, span_end
+        )
+
+    def _claim_gap(
+        self, pair: str, timeframe: Timeframe,
+        gap_start: datetime, gap_end: datetime
+    ) -> List[Future]:
+        pending = self._pending.setdefault((pair, timeframe), [])
+        shared = [
+            entry for entry in pending
+            if entry[0] < gap_end and gap_start < entry[1]
+        ]
+
+        unclaimed: List[Tuple[datetime, datetime]] = []
+        cursor = gap_start
+        for span_start, span_end, _ in sorted(shared, key=lambda e: e[0]):
+            if span_start > cursor:
+                unclaimed.append((cursor, span_start))
+            cursor = max(cursor, span_end)
+        if gap_end > cursor:
+            unclaimed.append((cursor, gap_end))
+
+        futures = [future for _, _, future in shared]
+        for span_start, span_end in unclaimed:
+            for missing_start, missing_end in (
+                window
+                for missing in self._ohlcv_warehouse.missing_spans(
+                    pair, timeframe, span_start, span_end
+                )
+                for window in self._split_span(timeframe, *missing)
+            ):
+                future = self._executor.submit(
+                    self._fill_gap, pair, timeframe,
+                    missing_start, missing_end
+                )
+                pending.append((missing_start, missing_end, future))
+                futures.append(future)
+        if shared:
+            logger.debug(
+                f"Joined {len(shared)} in-flight fetches for {pair} "
+                f"between {gap_start} and {gap_end}."
+            )
+        return futures
+
+    def _release_gap(
+        self, pair: str, timeframe: Timeframe, future: Future
+    ) -> None:
+        with self._pending_lock:
+            pending = self._pending.get((pair, timeframe), [])
+            pending[:] = [entry for entry in pending if entry[2] is not future]
+            if not pending:
+                self._pending.pop((pair, timeframe), None)
+
+    def _fill_gaps(
+        self, timeframe: Timeframe,
+        gaps: List[Tuple[str, datetime, datetime]]
+    ) -> None:
+        if self._resample:
+            gaps = self._resample_gaps(timeframe, gaps)
+
+        futures: Dict[Future, str] = {}
+        with self._pending_lock:
+            for pair, gap_start, gap_end in gaps:
+                for future in self._claim_gap(
+                    pair, timeframe, gap_start, gap_end
+                ):
+                    futures[future] = pair
+        for future, pair in futures.items():
+            future.add_done_callback(
+                partial(self._release_gap, pair, timeframe)
+            )
+
+        for future in as_completed(futures):
+            future.result()
+
+    def plan_gaps(
+        self, pair: str, timeframe: Timeframe, start: datetime, end: datetime
+    ) -> List[Tuple[datetime, datetime]]:
+        return [
+            window
+            for gap in self._missing_spans(pair, timeframe, start, end)
+            for window in self._split_span(timeframe, *gap)
+        ]
+
+    def fill_gap(
+        self, pair: str, timeframe: Timeframe,
+        gap_start: datetime, gap_end: datetime
+    ) -> int:
+        return self._fill_gap(pair, timeframe, gap_start, gap_end)
 
     def get_ohlcv_data(
         self, pair: str, timeframe: Timeframe, start: datetime, end: datetime
     ) -> pd.DataFrame:
-        data = self._ohlcv_warehouse.load_ohlcv_data(
-            pair, timeframe, start, end
+        gaps = self._missing_spans(pair, timeframe, start, end)
+        self._fill_gaps(timeframe, [(pair, *gap) for gap in gaps])
+
+        return self._load(pair, timeframe, start, end)
+
+    def get_ohlcv_data_many(
+        self,
+        pairs: Iterable[str],
+        timeframe: Timeframe,
+        start: datetime,
+        end: datetime,
+        as_frame: bool = False
+    ) -> Union[Dict[str, pd.DataFrame], pd.DataFrame]:
+        unique_pairs = list(dict.fromkeys(pairs))
+        gaps = [
+            (pair, gap_start, gap_end)
+            for pair in unique_pairs
+            for gap_start, gap_end in self._missing_spans(
+                pair, timeframe, start, end
+            )
+        ]
+        logger.info(
+            f"Filling {len(gaps)} gaps across {len(unique_pairs)} pairs."
         )
+        self._fill_gaps(timeframe, gaps)
 
-        full_idx = pd.date_range(start, end, freq=timeframe.pandas_freq)
-        missing_ts = full_idx.difference(data.index)
-        gaps = self._timestamps_to_spans(missing_ts, timeframe.timedelta)
+        frames = {
+            pair: self._load(pair, timeframe, start, end)
+            for pair in unique_pairs
+        }
+        if as_frame:
+            return pd.concat(frames, names=["pair"])
+        return frames
 
-        if not gaps:
-            return data
+    def follow(
+        self, pair: str, timeframe: Timeframe, window: timedelta
+    ) -> OHLCVFollower:
+        return OHLCVFollower(self, pair, timeframe, window)
 
-        for gap_start, gap_end in gaps:
-            logger.debug(f"Filling gap for {pair}: {gap_start} -> {gap_end}")
-            chunk = self._fetch_ohlcv_data(
-                pair, timeframe, gap_start, gap_end
+    def iter_ohlcv_data(
+        self,
+        pair: str,
+        timeframe: Timeframe,
+        start: datetime,
+        end: datetime,
+        chunk: int = 100_000
+    ) -> Iterator[pd.DataFrame]:
+        if not isinstance(chunk, int) or chunk < 1:
+            raise ValueError(
+                f"Invalid chunk {chunk!r}: must be an integer >= 1."
             )
-            self._ohlcv_warehouse.store_ohlcv_data(
-                pair=pair, timeframe=timeframe, data=chunk)
 
-        return self._ohlcv_warehouse.load_ohlcv_data(
-            pair, timeframe, start, end
+        start = self._to_utc(start)
+        end = self._to_utc(end)
+        span_start, span_end = self._bucket_bounds(timeframe, start, end)
+        window = timeframe.timedelta * chunk
+
+        chunk_start = span_start
+        while chunk_start < span_end:
+            chunk_end = min(chunk_start + window, span_end)
+            gaps = self._ohlcv_warehouse.missing_spans(
+                pair, timeframe, chunk_start, chunk_end
+            )
+            self._fill_gaps(timeframe, [(pair, *gap) for gap in gaps])
+
+            frame = self._load(
+                pair, timeframe, max(chunk_start, start),
+                min(chunk_end - timeframe.timedelta, end)
+            )
+            if not frame.empty:
+                yield frame
+            chunk_start = chunk_end
+
+    async def aget_ohlcv_data(
+        self, pair: str, timeframe: Timeframe, start: datetime, end: datetime
+    ) -> pd.DataFrame:
+        gaps = await asyncio.to_thread(
+            self._missing_spans, pair, timeframe, start, end
+        )
+        if self._resample:
+            remaining = await asyncio.to_thread(
+                self._resample_gaps, timeframe,
+                [(pair, *gap) for gap in gaps]
+            )
+            gaps = [(gap[1], gap[2]) for gap in remaining]
+
+        await asyncio.gather(*(
+            self._afill_gap(pair, timeframe, window_start, window_end)
+            for gap in gaps
+            for window_start, window_end in self._split_span(timeframe, *gap)
+        ))
+
+        return await asyncio.to_thread(
+            self._load, pair, timeframe, start, end
         )
@@ -0,0 +1,208 @@
+import bisect
+import threading
+from time import perf_counter
+from contextlib import contextmanager
+from typing import (
+    Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+)
+
+_Labels = Tuple[Tuple[str, str], ...]
+_Key = Tuple[str, _Labels]
+
+LATENCY_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+COUNT_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+_DEFAULT_BUCKETS: Dict[str, Sequence[float]] = {
+    "ohlcv_pages_per_span": COUNT_BUCKETS,
+}
+
+
+def _labels(labels: Dict[str, object]) -> _Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class MetricsSink:
+    def increment(self, name: str, value: float, labels: _Labels) -> None:
+        pass
+
+    def observe(self, name: str, value: float, labels: _Labels) -> None:
+        pass
+
+
+class InMemorySink(MetricsSink):
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[_Key, float] = {}
+        self._observations: Dict[_Key, List[float]] = {}
+
+    def increment(self, name: str, value: float, labels: _Labels) -> None:
+        with self._lock:
+            key = (name, labels)
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, labels: _Labels) -> None:
+        with self._lock:
+            self._observations.setdefault((name, labels), []).append(value)
+
+    def counter(self, name: str, **labels: object) -> float:
+        with self._lock:
+            if labels:
+                return self._counters.get((name, _labels(labels)), 0)
+            return sum(
+                value for (key, _), value in self._counters.items()
+                if key == name
+            )
+
+    def observations(self, name: str, **labels: object) -> List[float]:
+        with self._lock:
+            if labels:
+                return list(
+                    self._observations.get((name, _labels(labels)), [])
+                )
+            return [
+                value
+                for (key, _), values in self._observations.items()
+                if key == name
+                for value in values
+            ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._observations.clear()
+
+
+class PrometheusSink(MetricsSink):
+    def __init__(
+        self,
+        buckets: Optional[Dict[str, Sequence[float]]] = None,
+        default_buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        self._buckets = {**_DEFAULT_BUCKETS, **(buckets or {})}
+        self._default_buckets = default_buckets
+        self._lock = threading.Lock()
+        self._counters: Dict[_Key, float] = {}
+        self._histograms: Dict[_Key, Tuple[List[int], List[float]]] = {}
+
+    def _bounds(self, name: str) -> Sequence[float]:
+        return self._buckets.get(name, self._default_buckets)
+
+    def increment(self, name: str, value: float, labels: _Labels) -> None:
+        with self._lock:
+            key = (name, labels)
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, labels: _Labels) -> None:
+        bounds = self._bounds(name)
+        with self._lock:
+            counts, totals = self._histograms.setdefault(
+                (name, labels), ([0] * (len(bounds) + 1), [0.0])
+            )
+            counts[bisect.bisect_left(bounds, value)] += 1
+            totals[0] += value
+
+    def render(self) -> str:
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(
+                (key, (list(counts), totals[0]))
+                for key, (counts, totals) in self._histograms.items()
+            )
+
+        lines: List[str] = []
+        typed = set()
+        for (name, labels), value in counters:
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{_format(labels)} {_number(value)}")
+        for (name, labels), (counts, total) in histograms:
+            if name not in typed:
+                lines.append(f"# TYPE {name} histogram")
+                typed.add(name)
+            cumulative = 0
+            for bound, count in zip([*self._bounds(name), None], counts):
+                cumulative += count
+                le = "+Inf" if bound is None else _number(bound)
+                lines.append(
+                    f"{name}_bucket{_format((*labels, ('le', le)))} "
+                    f"{cumulative}"
+                )
+            lines.append(f"{name}_sum{_format(labels)} {_number(total)}")
+            lines.append(f"{name}_count{_format(labels)} {cumulative}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+class CallbackSink(MetricsSink):
+    def __init__(
+        self, callback: Callable[[str, str, float, Dict[str, str]], None]
+    ):
+        self._callback = callback
+
+    def increment(self, name: str, value: float, labels: _Labels) -> None:
+        self._callback("counter", name, value, dict(labels))
+
+    def observe(self, name: str, value: float, labels: _Labels) -> None:
+        self._callback("histogram", name, value, dict(labels))
+
+
+def _escape(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    )
+
+
+def _format(labels: _Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(
+        f'{key}="{_escape(value)}"' for key, value in labels
+    ) + "}"
+
+
+def _number(value: float) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+_sink: Optional[MetricsSink] = None
+
+
+def set_sink(sink: Optional[MetricsSink]) -> None:
+    global _sink
+    _sink = sink
+
+
+def get_sink() -> Optional[MetricsSink]:
+    return _sink
+
+
+def enabled() -> bool:
+    return _sink is not None
+
+
+def increment(name: str, value: float = 1, **labels: object) -> None:
+    sink = _sink
+    if sink is not None:
+        sink.increment(name, value, _labels(labels))
+
+
+def observe(name: str, value: float, **labels: object) -> None:
+    sink = _sink
+    if sink is not None:
+        sink.observe(name, value, _labels(labels))
+
+
+@contextmanager
+def timer(name: str, **labels: object) -> Iterator[None]:
+    sink = _sink
+    if sink is None:
+        yield
+        return
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        sink.observe(name, perf_counter() - started, _labels(labels))
@@ -1,7 +1,15 @@
-
+import numpy as np
+import pandas as pd
 from decimal import Decimal
 from datetime import datetime
 from pydantic import BaseModel
+from typing import List, Sequence, Union
+
+_UTC = pd.DatetimeTZDtype("ns", "UTC")
+
+
+def _from_ns(value: int) -> datetime:
+    return pd.Timestamp(value, tz="UTC").to_pydatetime()
 
 
 class OHLCVData(BaseModel):
@@ -11,3 +19,130 @@ class OHLCVData(BaseModel):
     low: Decimal
     close: Decimal
     volume: Decimal
+
+
+class OHLCVBatch:
+    COLUMNS = ("open", "high", "low", "close", "volume")
+
+    def __init__(
+        self,
+        timestamps: np.ndarray,
+        open: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray
+    ):
+        self.timestamps = np.ascontiguousarray(timestamps, dtype=np.int64)
+        self.open = np.ascontiguousarray(open, dtype=np.float64)
+        self.high = np.ascontiguousarray(high, dtype=np.float64)
+        self.low = np.ascontiguousarray(low, dtype=np.float64)
+        self.close = np.ascontiguousarray(close, dtype=np.float64)
+        self.volume = np.ascontiguousarray(volume, dtype=np.float64)
+        rows = len(self.timestamps)
+        if any(len(column) != rows for column in self.columns):
+            raise ValueError("All OHLCVBatch columns must have equal length.")
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __getitem__(self, key: Union[slice, np.ndarray]) -> "OHLCVBatch":
+        return OHLCVBatch(
+            self.timestamps[key], *(column[key] for column in self.columns)
+        )
+
+    def __repr__(self) -> str:
+        return f"OHLCVBatch(rows={len(self)})"
+
+    @property
+    def columns(self) -> List[np.ndarray]:
+        return [self.open, self.high, self.low, self.close, self.volume]
+
+    def copy(self) -> "OHLCVBatch":
+        return OHLCVBatch(
+            self.timestamps.copy(), *(column.copy() for column in self.columns)
+        )
+
+    @classmethod
+    def empty(cls) -> "OHLCVBatch":
+        return cls(np.empty(0, np.int64), *(
+            np.empty(0, np.float64) for _ in cls.COLUMNS
+        ))
+
+    @classmethod
+    def concat(cls, batches: Sequence["OHLCVBatch"]) -> "OHLCVBatch":
+        if not batches:
+            return cls.empty()
+        if len(batches) == 1:
+            return batches[0]
+        return cls(
+            np.concatenate([batch.timestamps for batch in batches]),
+            *(
+                np.concatenate([batch.columns[i] for batch in batches])
+                for i in range(len(cls.COLUMNS))
+            )
+        )
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> "OHLCVBatch":
+        index = pd.DatetimeIndex(frame.index)
+        if index.tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+        timestamps = index.as_unit("ns").to_numpy().view(np.int64)
+        return cls(timestamps, *(
+            frame[name].to_numpy(dtype=np.float64) for name in cls.COLUMNS
+        ))
+
+    @classmethod
+    def from_models(cls, data: Sequence[OHLCVData]) -> "OHLCVBatch":
+        if not data:
+            return cls.empty()
+        index = pd.to_datetime([item.timestamp for item in data], utc=True)
+        return cls(
+            index.tz_localize(None).as_unit("ns").to_numpy().view(np.int64),
+            *(
+                np.array(
+                    [float(getattr(item, name)) for item in data], np.float64
+                )
+                for name in cls.COLUMNS
+            )
+        )
+
+    def min_timestamp(self) -> datetime:
+        if not len(self):
+            raise ValueError("min_timestamp() of an empty OHLCVBatch")
+        return _from_ns(int(self.timestamps.min()))
+
+    def max_timestamp(self) -> datetime:
+        if not len(self):
+            raise ValueError("max_timestamp() of an empty OHLCVBatch")
+        return _from_ns(int(self.timestamps.max()))
+
+    def to_pandas(self) -> pd.DataFrame:
+        index = pd.DatetimeIndex(
+            pd.arrays.DatetimeArray._simple_new(  # type: ignore[attr-defined]
+                self.timestamps.view("datetime64[ns]"), dtype=_UTC
+            ),
+            name="timestamp",
+            copy=False
+        )
+        return pd.DataFrame(
+            dict(zip(self.COLUMNS, self.columns)), index=index, copy=False
+        )
+
+    def to_models(self) -> List[OHLCVData]:
+        timestamps = pd.DatetimeIndex(
+            self.timestamps.view("datetime64[ns]")
+        ).tz_localize("UTC").to_pydatetime()
+        open_, high, low, close, volume = (
+            [Decimal(repr(value)) for value in column.tolist()]
+            for column in self.columns
+        )
+        return [
+            OHLCVData.model_construct(
+                timestamp=timestamp, open=o, high=h, low=lo, close=c, volume=v
+            )
+            for timestamp, o, h, lo, c, v in zip(
+                timestamps, open_, high, low, close, volume
+            )
+        ]
@@ -1,40 +1,59 @@
-
+import json
 import logging
+import aiohttp
 import requests
-from decimal import Decimal
+import numpy as np
+import pandas as pd
+from time import perf_counter
+from decimal import Decimal, InvalidOperation
 from datetime import datetime
-from typing import Optional, List, Union, Dict
+from typing import Any, Optional, List, Union, Dict, Tuple
 
+from . import metrics
 from .timeframe import Timeframe
-from .backoff import backoff
-from .model import OHLCVData
+from .backoff import backoff, RetryPolicy
+from .model import OHLCVBatch, OHLCVData
 from .config import Config
+from .rate_limiter import RateLimiter
 
 logger = logging.getLogger(__name__)
 
+_Params = Dict[str, Union[str, int, None]]
+
+_COLUMNS = ("open", "high", "low", "close", "volume")
+_DECODE_ERRORS = (KeyError, TypeError, ValueError, InvalidOperation)
+
+_RETRY_POLICY = RetryPolicy(
+    delay=1, retries=5, max_delay=30, deadline=120, jitter=True
+)
 
-class MoralisAPI:
+
+class _MoralisAPIBase:
     _BASE_URL = "https://solana-gateway.moralis.io/token/mainnet/pairs"
+    MAX_LIMIT = 1000
     _config: Config = Config()
 
-    def __init__(self, api_key: Optional[str] = None):
-        self._api_key = self._config.moralis_api_key
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        rate_limiter: Optional[RateLimiter] = None
+    ):
+        self._api_key: str = api_key or str(self._config.moralis_api_key)
+        self._rate_limiter = rate_limiter
 
-    @backoff(delay=2, retries=4)
-    def get_ohlcv_data(
+    def _build_request(
         self,
         pair_address: str,
         timeframe: Timeframe,
         currency: str,
         from_date: datetime,
         to_date: datetime,
-        limit: int = 100,
-        cursor: Optional[str] = None
-    ) -> List[OHLCVData]:
-        tf_str: str = str(timeframe.value)
+        limit: int,
+        cursor: Optional[str]
+    ) -> Tuple[str, _Params, Dict[str, str]]:
         url = f"{self._BASE_URL}/{pair_address}/ohlcv"
-        params: Dict[str, Union[str, int, None]] = {
-            "timeframe": tf_str,
+        params: _Params = {
+            "timeframe": timeframe.label,
             "fromDate": from_date.isoformat(),
             "toDate": to_date.isoformat(),
             "limit": limit,
@@ -43,21 +62,163 @@ class MoralisAPI:
         if cursor:
             params["cursor"] = cursor
 
-        headers = {"X-API-Key": self._api_key}
-
-        req = requests.Request('GET', url, params=params, headers=headers)
-        prepped = req.prepare()
-        logger.debug(f"Request URL: {prepped.url}")
-
         logger.info(
             f"Fetching OHLCV data for {pair_address}, "
-            f"timeframe: {tf_str}, "
+            f"timeframe: {timeframe.label}, "
             f"from {from_date} to {to_date}, "
             f"limit: {limit}, cursor: {cursor}"
         )
+        return url, params, {"X-API-Key": self._api_key}
+
+    def _record_response(
+        self, status: Union[int, str], seconds: float, size: int
+    ) -> None:
+        if not metrics.enabled():
+            return
+        metrics.increment("ohlcv_requests_total", status=status)
+        metrics.observe("ohlcv_request_seconds", seconds, status=status)
+        metrics.increment("ohlcv_response_bytes_total", size)
+
+    def _decode_batch(
+        self, result: List[Dict[str, Any]], float64: bool
+    ) -> pd.DataFrame:
+        index = pd.DatetimeIndex(
+            pd.to_datetime(
+                [entry["timestamp"] for entry in result], format="ISO8601"
+            ),
+            name="timestamp"
+        )
+        if index.tz is not None:
+            index = index.tz_convert("UTC")
+
+        columns: Dict[str, np.ndarray] = {}
+        for name in _COLUMNS:
+            values = [entry[name] for entry in result]
+            if float64:
+                column = np.array(values, dtype=np.float64)
+                if not np.isfinite(column).all():
+                    raise ValueError(f"Non-finite value in {name!r}")
+            else:
+                column = np.array(
+                    [Decimal(value) for value in values], dtype=object
+                )
+                if not all(value.is_finite() for value in column):
+                    raise ValueError(f"Non-finite value in {name!r}")
+            columns[name] = column
+
+        return pd.DataFrame(columns, index=index, copy=False)
+
+    def _decode_result(
+        self, data: Dict[str, Any], float64: bool
+    ) -> pd.DataFrame:
+        result = data.get("result", [])
+        logger.info(f"Received OHLCV data, {len(result)} records.")
+
+        with metrics.timer("ohlcv_parse_seconds"):
+            frame = self._decode_result_rows(result, float64)
+        metrics.increment("ohlcv_rows_parsed_total", len(frame))
+        return frame
+
+    def _decode_result_rows(
+        self, result: List[Dict[str, Any]], float64: bool
+    ) -> pd.DataFrame:
+        try:
+            return self._decode_batch(result, float64)
+        except _DECODE_ERRORS as e:
+            logger.warning(
+                f"Batch decode failed ({e}); validating entries one by one."
+            )
+            metrics.increment("ohlcv_parse_fallbacks_total")
+
+        valid = []
+        for entry in result:
+            try:
+                self._decode_batch([entry], float64)
+                valid.append(entry)
+            except _DECODE_ERRORS as e:
+                logger.error(f"Error processing entry {entry}: {e}")
+
+        return self._decode_batch(valid, float64)
+
+    def _decode_page(
+        self, data: Dict[str, Any]
+    ) -> Tuple[OHLCVBatch, Optional[str]]:
+        batch = OHLCVBatch.from_frame(self._decode_result(data, True))
+        return batch, data.get("cursor") or None
+
+    def _to_models(self, frame: pd.DataFrame) -> List[OHLCVData]:
+        return [
+            OHLCVData.model_construct(
+                timestamp=timestamp,
+                open=open_, high=high, low=low, close=close, volume=volume
+            )
+            for timestamp, open_, high, low, close, volume in zip(
+                pd.DatetimeIndex(frame.index).to_pydatetime(),
+                *(frame[name].tolist() for name in _COLUMNS)
+            )
+        ]
+
+
+class MoralisAPI(_MoralisAPIBase):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        pool_maxsize: int = 10,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        session: Optional[requests.Session] = None,
+        rate_limiter: Optional[RateLimiter] = None
+    ):
+        super().__init__(api_key, rate_limiter)
+        self._timeout = (connect_timeout, read_timeout)
+        if session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=1, pool_maxsize=pool_maxsize
+            )
+            session.mount("https://", adapter)
+        self._session = session
+
+    def __enter__(self) -> "MoralisAPI":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._session.close()
+
+    @backoff(policy=_RETRY_POLICY)
+    def _get_json(
+        self,
+        pair_address: str,
+        timeframe: Timeframe,
+        currency: str,
+        from_date: datetime,
+        to_date: datetime,
+        limit: int,
+        cursor: Optional[str],
+        float64: bool
+    ) -> Dict[str, Any]:
+        url, params, headers = self._build_request(
+            pair_address, timeframe, currency, from_date, to_date,
+            limit, cursor
+        )
+
+        req = requests.Request('GET', url, params=params, headers=headers)
+        prepped = self._session.prepare_request(req)
+        logger.debug(f"Request URL: {prepped.url}")
+
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire()
 
+        started = perf_counter()
         try:
-            response = requests.get(url, params=params, headers=headers)
+            response = self._session.send(prepped, timeout=self._timeout)
+            self._record_response(
+                response.status_code, perf_counter() - started,
+                len(response.content)
+            )
             logger.debug(f"Status code: {response.status_code}")
             if response.status_code != 200:
                 logger.error(f"Response headers: {response.headers}")
@@ -67,30 +228,230 @@ class MoralisAPI:
                 logger.debug(f"Response text: {response.text}")
 
             response.raise_for_status()
-            data = response.json(parse_float=Decimal)
-
-            logger.info(
-                f"Received OHLCV data, {len(data.get('result', []))} records."
+            data: Dict[str, Any] = (
+                response.json() if float64
+                else response.json(parse_float=Decimal)
             )
 
         except requests.exceptions.RequestException as e:
+            if e.response is None:
+                self._record_response("error", perf_counter() - started, 0)
             logger.error(f"Error fetching OHLCV data: {e}")
             raise
 
-        ohlcv_list = []
-        for entry in data.get("result", []):
-            try:
-                ohlcv = OHLCVData(
-                    timestamp=datetime.fromisoformat(entry["timestamp"]),
-                    open=Decimal(entry["open"]),
-                    high=Decimal(entry["high"]),
-                    low=Decimal(entry["low"]),
-                    close=Decimal(entry["close"]),
-                    volume=Decimal(entry["volume"])
+        return data
+
+    def get_ohlcv_frame(
+        self,
+        pair_address: str,
+        timeframe: Timeframe,
+        currency: str,
+        from_date: datetime,
+        to_date: datetime,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        float64: bool = False
+    ) -> pd.DataFrame:
+        data = self._get_json(
+            pair_address, timeframe, currency, from_date, to_date,
+            limit, cursor, float64
+        )
+        return self._decode_result(data, float64)
+
+    def get_ohlcv_page(
+        self,
+        pair_address: str,
+        timeframe: Timeframe,
+        currency: str,
+        from_date: datetime,
+        to_date: datetime,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[OHLCVBatch, Optional[str]]:
+        return self._decode_page(self._get_json(
+            pair_address, timeframe, currency, from_date, to_date,
+            limit, cursor, True
+        ))
+
+    def get_ohlcv_batch(
+        self,
+        pair_address: str,
+        timeframe: Timeframe,
+        currency: str,
+        from_date: datetime,
+        to_date: datetime,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> OHLCVBatch:
+        return OHLCVBatch.from_frame(self.get_ohlcv_frame(
+            pair_address, timeframe, currency, from_date, to_date,
+            limit, cursor, float64=True
+        ))
+
+    def get_ohlcv_data(
+        self,
+        pair_address: str,
+        timeframe: Timeframe,
+        currency: str,
+        from_date: datetime,
+        to_date: datetime,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> List[OHLCVData]:
+        return self._to_models(self.get_ohlcv_frame(
+            pair_address, timeframe, currency, from_date, to_date,
+            limit, cursor
+        ))
+
+
+class AsyncMoralisAPI(_MoralisAPIBase):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        pool_maxsize: int = 100,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        session: Optional[aiohttp.ClientSession] = None,
+        rate_limiter: Optional[RateLimiter] = None
+    ):
+        super().__init__(api_key, rate_limiter)
+        self._pool_maxsize = pool_maxsize
+        self._timeout = aiohttp.ClientTimeout(
+            sock_connect=connect_timeout, sock_read=read_timeout
+        )
+        self._session = session
+
+    async def __aenter__(self) -> "AsyncMoralisAPI":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self._pool_maxsize),
+                timeout=self._timeout
+            )
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    @backoff(policy=_RETRY_POLICY)
+    async def _get_json(
+        self,
+        pair_address: str,
+        timeframe: Timeframe,
+        currency: str,
+        from_date: datetime,
+        to_date: datetime,
+        limit: int,
+        cursor: Optional[str],
+        float64: bool
+    ) -> Dict[str, Any]:
+        url, params, headers = self._build_request(
+            pair_address, timeframe, currency, from_date, to_date,
+            limit, cursor
+        )
+        query = {k: str(v) for k, v in params.items() if v is not None}
+
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire_async()
+
+        started = perf_counter()
+        try:
+            async with self._get_session().get(
+                url, params=query, headers=headers
+            ) as response:
+                logger.debug(f"Request URL: {response.url}")
+                logger.debug(f"Status code: {response.status}")
+                body = await response.read()
+                self._record_response(
+                    response.status, perf_counter() - started, len(body)
                 )
-                ohlcv_list.append(ohlcv)
+                text = body.decode(response.get_encoding())
+                if response.status != 200:
+                    logger.error(f"Response headers: {response.headers}")
+                    logger.error(f"Response text: {text}")
+                else:
+                    logger.debug(f"Response headers: {response.headers}")
+                    logger.debug(f"Response text: {text}")
 
-            except Exception as e:
-                logger.error(f"Error processing entry {entry}: {e}")
+                response.raise_for_status()
+
+        except aiohttp.ClientError as e:
+            if not isinstance(e, aiohttp.ClientResponseError):
+                self._record_response("error", perf_counter() - started, 0)
+            logger.error(f"Error fetching OHLCV data: {e}")
+            raise
 
-        return ohlcv_list
+        data: Dict[str, Any] = (
+            json.loads(text) if float64
+            else json.loads(text, parse_float=Decimal)
+        )
+        return data
+
+    async def get_ohlcv_frame(
+        self,
+        pair_address: str,
+        timeframe: Timeframe,
+        currency: str,
+        from_date: datetime,
+        to_date: datetime,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        float64: bool = False
+    ) -> pd.DataFrame:
+        data = await self._get_json(
+            pair_address, timeframe, currency, from_date, to_date,
+            limit, cursor, float64
+        )
+        return self._decode_result(data, float64)
+
+    async def get_ohlcv_page(
+        self,
+        pair_address: str,
+        timeframe: Timeframe,
+        currency: str,
+        from_date: datetime,
+        to_date: datetime,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[OHLCVBatch, Optional[str]]:
+        return self._decode_page(await self._get_json(
+            pair_address, timeframe, currency, from_date, to_date,
+            limit, cursor, True
+        ))
+
+    async def get_ohlcv_batch(
+        self,
+        pair_address: str,
+        timeframe: Timeframe,
+        currency: str,
+        from_date: datetime,
+        to_date: datetime,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> OHLCVBatch:
+        return OHLCVBatch.from_frame(await self.get_ohlcv_frame(
+            pair_address, timeframe, currency, from_date, to_date,
+            limit, cursor, float64=True
+        ))
+
+    async def get_ohlcv_data(
+        self,
+        pair_address: str,
+        timeframe: Timeframe,
+        currency: str,
+        from_date: datetime,
+        to_date: datetime,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> List[OHLCVData]:
+        return self._to_models(await self.get_ohlcv_frame(
+            pair_address, timeframe, currency, from_date, to_date,
+            limit, cursor
+        ))
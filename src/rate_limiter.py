@@ -0,0 +1,102 @@
+import os
+import fcntl
+import struct
+import asyncio
+import logging
+import threading
+from time import monotonic, sleep, time
+from pathlib import Path
+from typing import Iterator, Tuple
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+_STATE = struct.Struct("<dd")
+
+
+class RateLimiter:
+    def __init__(self, rate: float, burst: int = 1):
+        if not isinstance(rate, (int, float)) or rate <= 0:
+            raise ValueError(
+                f"Invalid rate {rate!r}: must be a positive number."
+            )
+        if not isinstance(burst, int) or burst < 1:
+            raise ValueError(
+                f"Invalid burst {burst!r}: must be an integer >= 1."
+            )
+        self._rate = float(rate)
+        self._burst = burst
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = monotonic()
+
+    @contextmanager
+    def _state(self) -> Iterator[None]:
+        with self._lock:
+            yield
+
+    def _now(self) -> float:
+        return monotonic()
+
+    def _load(self) -> Tuple[float, float]:
+        return self._tokens, self._updated
+
+    def _save(self, tokens: float, updated: float) -> None:
+        self._tokens, self._updated = tokens, updated
+
+    def reserve(self) -> float:
+        with self._state():
+            tokens, updated = self._load()
+            now = self._now()
+            elapsed = max(0.0, now - updated)
+            tokens = min(float(self._burst), tokens + elapsed * self._rate)
+            tokens -= 1
+            self._save(tokens, now)
+        return max(0.0, -tokens / self._rate)
+
+    def acquire(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            logger.debug(f"Rate limited; waiting {wait:.3f} seconds.")
+            sleep(wait)
+
+    async def acquire_async(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            logger.debug(f"Rate limited; waiting {wait:.3f} seconds.")
+            await asyncio.sleep(wait)
+
+
+class FileRateLimiter(RateLimiter):
+    def __init__(self, path: Path, rate: float, burst: int = 1):
+        super().__init__(rate, burst)
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    @contextmanager
+    def _state(self) -> Iterator[None]:
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _now(self) -> float:
+        return time()
+
+    def _load(self) -> Tuple[float, float]:
+        raw = os.pread(self._fd, _STATE.size, 0)
+        if len(raw) < _STATE.size:
+            return float(self._burst), self._now()
+        tokens, updated = _STATE.unpack(raw)
+        return tokens, updated
+
+    def _save(self, tokens: float, updated: float) -> None:
+        os.pwrite(self._fd, _STATE.pack(tokens, updated), 0)
@@ -0,0 +1,55 @@
+import numpy as np
+from typing import List
+
+from .model import OHLCVBatch
+from .timeframe import Timeframe
+
+_CALENDAR = (Timeframe.W1, Timeframe.M1)
+
+
+def _seconds(timeframe: Timeframe) -> int:
+    return int(round(timeframe.minutes * 60))
+
+
+def can_resample(source: Timeframe, target: Timeframe) -> bool:
+    if source in _CALENDAR or target in _CALENDAR:
+        return False
+    source_seconds, target_seconds = _seconds(source), _seconds(target)
+    return (
+        target_seconds > source_seconds
+        and target_seconds % source_seconds == 0
+    )
+
+
+def resample_sources(target: Timeframe) -> List[Timeframe]:
+    return sorted(
+        (source for source in Timeframe if can_resample(source, target)),
+        key=_seconds, reverse=True
+    )
+
+
+def resample_batch(batch: OHLCVBatch, target: Timeframe) -> OHLCVBatch:
+    if target in _CALENDAR:
+        raise ValueError(
+            f"Invalid target {target!r}: calendar timeframes cannot be "
+            "derived from fixed-width buckets."
+        )
+    if not len(batch):
+        return OHLCVBatch.empty()
+
+    if (np.diff(batch.timestamps) < 0).any():
+        batch = batch[np.argsort(batch.timestamps, kind="stable")]
+
+    step = _seconds(target) * 1_000_000_000
+    buckets = batch.timestamps // step * step
+    starts = np.flatnonzero(np.diff(buckets, prepend=buckets[0] - 1))
+    ends = np.append(starts[1:], len(buckets)) - 1
+
+    return OHLCVBatch(
+        buckets[starts],
+        batch.open[starts],
+        np.maximum.reduceat(batch.high, starts),
+        np.minimum.reduceat(batch.low, starts),
+        batch.close[ends],
+        np.add.reduceat(batch.volume, starts)
+    )
@@ -22,6 +22,10 @@ class Timeframe(Enum):
         self._label = label
         self._minutes = minutes
 
+    @property
+    def label(self) -> str:
+        return self._label
+
     @property
     def minutes(self) -> float:
         return self._minutes
@@ -1,35 +1,221 @@
-
+import os
+import struct
 import logging
+import threading
+import numpy as np
 import pandas as pd
-from typing import List
+from typing import Callable, Dict, List, Tuple, Union
 from pathlib import Path
 from datetime import datetime
 
+from .coverage import Coverage
 from .timeframe import Timeframe
-from .model import OHLCVData
+from .model import OHLCVBatch, OHLCVData
 
 logger = logging.getLogger(__name__)
 
+_MAGIC = b"OHLCV\x00\x00\x01"
+_HEADER = struct.Struct("<8sQ")
+_HEADER_SIZE = 64
+_COLUMNS = OHLCVBatch.COLUMNS
+_EXTENSION = ".ohlcv"
+_COVERAGE_EXTENSION = ".coverage.npy"
+
+StoreListener = Callable[[str, Timeframe, int, int], None]
+
+
+def _to_ns(dt: datetime) -> int:
+    ts = pd.Timestamp(dt)
+    ts = ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+    return int(ts.value)
+
+
+def _from_ns(value: int) -> datetime:
+    return pd.Timestamp(value, tz="UTC").to_pydatetime()
+
 
 class OHLCVWarehouse:
-    def __init__(self, db_path: Path = Path("data/ohlcv_data.db")):
-        pass
+    def __init__(
+        self, db_path: Path = Path("data/ohlcv"), mmap: bool = False
+    ):
+        self._db_path = Path(db_path)
+        self._mmap = mmap
+        self._mapped: Dict[Path, Tuple[Tuple[int, int, int], OHLCVBatch]] = {}
+        self._locks: Dict[Tuple[str, Timeframe], threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._store_listeners: List[StoreListener] = []
+        self._ensure_db_directory()
 
     def _ensure_db_directory(self) -> None:
-        pass
+        self._db_path.mkdir(parents=True, exist_ok=True)
+
+    def _partition_path(self, pair: str, timeframe: Timeframe) -> Path:
+        return self._db_path / pair / f"{timeframe.name}{_EXTENSION}"
+
+    def _coverage_path(self, pair: str, timeframe: Timeframe) -> Path:
+        return self._db_path / pair / f"{timeframe.name}{_COVERAGE_EXTENSION}"
+
+    def _partition_lock(
+        self, pair: str, timeframe: Timeframe
+    ) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault((pair, timeframe), threading.Lock())
+
+    def _tmp_path(self, path: Path) -> Path:
+        return path.with_name(
+            f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+
+    def _read_rows(self, path: Path) -> int:
+        with open(path, "rb") as f:
+            magic, rows = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != _MAGIC:
+            raise ValueError(f"Not an OHLCV partition file: {path}")
+        return int(rows)
+
+    def _open_partition(self, path: Path) -> OHLCVBatch:
+        rows = self._read_rows(path)
+        if rows == 0:
+            return OHLCVBatch.empty()
+
+        mapped = np.memmap(
+            path, dtype=np.uint8, mode="r", offset=_HEADER_SIZE,
+            shape=(rows * 8 * (len(_COLUMNS) + 1),)
+        )
+        return OHLCVBatch(mapped[:rows * 8].view("<i8"), *(
+            mapped[(i + 1) * rows * 8:(i + 2) * rows * 8].view("<f8")
+            for i in range(len(_COLUMNS))
+        ))
+
+    def _mapped_partition(self, path: Path) -> OHLCVBatch:
+        stat = path.stat()
+        key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        cached = self._mapped.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        partition = self._open_partition(path)
+        self._mapped[path] = (key, partition)
+        return partition
+
+    def _write_partition(self, path: Path, batch: OHLCVBatch) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._tmp_path(path)
+        with open(tmp_path, "wb") as f:
+            header = _HEADER.pack(_MAGIC, len(batch))
+            f.write(header.ljust(_HEADER_SIZE, b"\x00"))
+            f.write(batch.timestamps.astype("<i8", copy=False).tobytes())
+            for column in batch.columns:
+                f.write(column.astype("<f8", copy=False).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
 
-    def _ensure_table_exists(self) -> None:
-        pass
+    def _read_coverage(self, path: Path) -> Coverage:
+        if not path.exists():
+            return Coverage()
+        return Coverage.from_array(np.load(path))
+
+    def _write_coverage(self, path: Path, coverage: Coverage) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._tmp_path(path)
+        with open(tmp_path, "wb") as f:
+            np.save(f, coverage.to_array())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _empty_frame(self) -> pd.DataFrame:
+        return OHLCVBatch.empty().to_pandas()
+
+    def _upsert(self, path: Path, new: OHLCVBatch) -> None:
+        if path.exists():
+            merged = OHLCVBatch.concat([self._open_partition(path), new])
+        else:
+            merged = new
+
+        order = np.argsort(merged.timestamps, kind="stable")
+        timestamps = merged.timestamps[order]
+        keep = np.empty(len(timestamps), dtype=bool)
+        keep[:-1] = timestamps[1:] != timestamps[:-1]
+        keep[-1] = True
+
+        self._write_partition(path, merged[order[keep]])
 
     def close(self) -> None:
-        pass
+        self._mapped.clear()
+
+    def add_store_listener(self, listener: StoreListener) -> None:
+        self._store_listeners.append(listener)
+
+    def remove_store_listener(self, listener: StoreListener) -> None:
+        self._store_listeners.remove(listener)
 
     def store_ohlcv_data(
-        self, pair: str, timeframe: Timeframe, data: List[OHLCVData]
+        self,
+        pair: str,
+        timeframe: Timeframe,
+        data: Union[OHLCVBatch, List[OHLCVData]]
     ) -> None:
-        pass
+        if not len(data):
+            return
+
+        batch = (
+            data if isinstance(data, OHLCVBatch)
+            else OHLCVBatch.from_models(data)
+        )
+        path = self._partition_path(pair, timeframe)
+
+        with self._partition_lock(pair, timeframe):
+            self._upsert(path, batch)
+            start = int(batch.timestamps.min())
+            end = int(batch.timestamps.max())
+            for listener in self._store_listeners:
+                listener(pair, timeframe, start, end)
+        logger.debug(f"Stored {len(data)} rows for {pair} {timeframe.name}.")
 
     def load_ohlcv_data(
         self, pair: str, timeframe: Timeframe, start: datetime, end: datetime
     ) -> pd.DataFrame:
-        return pd.DataFrame()
+        path = self._partition_path(pair, timeframe)
+        if not path.exists():
+            return self._empty_frame()
+
+        if self._mmap:
+            partition = self._mapped_partition(path)
+        else:
+            partition = self._open_partition(path)
+        timestamps = partition.timestamps
+        lo = int(np.searchsorted(timestamps, _to_ns(start), side="left"))
+        hi = int(np.searchsorted(timestamps, _to_ns(end), side="right"))
+        if hi <= lo:
+            return self._empty_frame()
+
+        batch = partition[lo:hi]
+        if not self._mmap:
+            batch = batch.copy()
+        return batch.to_pandas()
+
+    def mark_covered(
+        self, pair: str, timeframe: Timeframe, start: datetime, end: datetime
+    ) -> None:
+        path = self._coverage_path(pair, timeframe)
+        with self._partition_lock(pair, timeframe):
+            coverage = self._read_coverage(path)
+            coverage.add(_to_ns(start), _to_ns(end))
+            self._write_coverage(path, coverage)
+        logger.debug(
+            f"Marked {pair} {timeframe.name} covered from {start} to {end}; "
+            f"{len(coverage)} covered intervals."
+        )
+
+    def missing_spans(
+        self, pair: str, timeframe: Timeframe, start: datetime, end: datetime
+    ) -> List[Tuple[datetime, datetime]]:
+        coverage = self._read_coverage(self._coverage_path(pair, timeframe))
+        return [
+            (_from_ns(span_start), _from_ns(span_end))
+            for span_start, span_end in coverage.missing(
+                _to_ns(start), _to_ns(end)
+            )
+        ]
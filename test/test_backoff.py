@@ -1,6 +1,10 @@
-
+import asyncio
 import pytest
-from src.backoff import backoff
+from types import SimpleNamespace
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+from src.backoff import backoff, RetryPolicy
 
 
 @pytest.fixture(autouse=True)
@@ -90,3 +94,143 @@ class TestBackoff:
         assert result == "OK"
         assert call_count == succeed_on
         assert delays == [1, 2]
+
+    def test_async_function_is_retried(self, monkeypatch):
+        delays = []
+
+        async def fake_sleep(s):
+            delays.append(s)
+        monkeypatch.setattr("src.backoff.async_sleep", fake_sleep)
+
+        call_count = 0
+
+        @backoff(delay=1, retries=5)
+        async def flaky():
+            nonlocal call_count
+            call_count += 1
+            if call_count < 3:
+                raise RuntimeError("temporary fail")
+            return "OK"
+
+        assert asyncio.run(flaky()) == "OK"
+        assert call_count == 3
+        assert delays == [1, 2]
+
+    def test_async_value_error_bubbles_immediately(self):
+        call_count = 0
+
+        @backoff(delay=0.01, retries=5)
+        async def fail_with_value_error():
+            nonlocal call_count
+            call_count += 1
+            raise ValueError("bad input")
+
+        with pytest.raises(ValueError):
+            asyncio.run(fail_with_value_error())
+
+        assert call_count == 1
+
+
+class HTTPFailure(Exception):
+    def __init__(self, status, headers=None):
+        super().__init__(f"HTTP {status}")
+        self.response = SimpleNamespace(
+            status_code=status, headers=headers or {}
+        )
+
+
+class TestRetryPolicy:
+    @pytest.mark.parametrize("kwargs", [
+        {"delay": -1},
+        {"retries": 0},
+        {"max_delay": -1},
+        {"deadline": 0},
+    ])
+    def test_invalid_settings_raise(self, kwargs):
+        with pytest.raises(ValueError):
+            RetryPolicy(**kwargs)
+
+    @pytest.mark.parametrize("status, retryable", [
+        (400, False),
+        (401, False),
+        (404, False),
+        (429, True),
+        (500, True),
+        (503, True),
+    ])
+    def test_classifies_http_status(self, status, retryable):
+        assert RetryPolicy().is_retryable(HTTPFailure(status)) is retryable
+
+    def test_connection_errors_are_retryable(self):
+        assert RetryPolicy().is_retryable(ConnectionError("reset"))
+
+    def test_retry_after_seconds(self):
+        e = HTTPFailure(429, {"Retry-After": "7"})
+        assert RetryPolicy().retry_after(e) == 7
+
+    def test_retry_after_http_date(self):
+        when = datetime.now(timezone.utc) + timedelta(seconds=30)
+        e = HTTPFailure(503, {"Retry-After": format_datetime(when)})
+        assert 25 < RetryPolicy().retry_after(e) <= 30
+
+    def test_delay_is_capped(self):
+        policy = RetryPolicy(delay=1, max_delay=5)
+        delays = [policy.next_delay(n, RuntimeError()) for n in range(1, 6)]
+        assert delays == [1, 2, 4, 5, 5]
+
+    def test_full_jitter_stays_within_bounds(self):
+        policy = RetryPolicy(delay=1, max_delay=8, jitter=True)
+        delays = [policy.next_delay(4, RuntimeError()) for _ in range(200)]
+        assert all(0 <= d <= 8 for d in delays)
+        assert len(set(delays)) > 1
+
+
+class TestBackoffWithPolicy:
+    def test_client_error_fails_fast(self, monkeypatch):
+        delays = []
+        monkeypatch.setattr("src.backoff.sleep", lambda s: delays.append(s))
+        call_count = 0
+
+        @backoff(policy=RetryPolicy(delay=2, retries=4))
+        def not_found():
+            nonlocal call_count
+            call_count += 1
+            raise HTTPFailure(404)
+
+        with pytest.raises(HTTPFailure):
+            not_found()
+
+        assert call_count == 1
+        assert delays == []
+
+    def test_honours_retry_after(self, monkeypatch):
+        delays = []
+        monkeypatch.setattr("src.backoff.sleep", lambda s: delays.append(s))
+        call_count = 0
+
+        @backoff(policy=RetryPolicy(delay=1, retries=3))
+        def throttled():
+            nonlocal call_count
+            call_count += 1
+            if call_count == 1:
+                raise HTTPFailure(429, {"Retry-After": "3"})
+            return "OK"
+
+        assert throttled() == "OK"
+        assert delays == [3]
+
+    def test_deadline_stops_retrying(self, monkeypatch):
+        delays = []
+        monkeypatch.setattr(
+            "src.backoff.monotonic", lambda: float(sum(delays))
+        )
+        monkeypatch.setattr("src.backoff.sleep", lambda s: delays.append(s))
+
+        @backoff(policy=RetryPolicy(delay=4, retries=10, deadline=10))
+        def always_fails():
+            raise RuntimeError("nope")
+
+        with pytest.raises(RuntimeError):
+            always_fails()
+
+        assert delays == [4]
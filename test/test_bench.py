@@ -0,0 +1,19 @@
+from bench.benchmarks import BENCHMARKS, main, run
+
+
+class TestBenchmarks:
+    def test_smoke_run_reports_every_benchmark(self):
+        report = run(list(BENCHMARKS), scale=0.001, repeat=1)
+
+        names = {result["name"].split(".")[0] for result in report["results"]}
+        assert names == set(BENCHMARKS)
+        assert all(result["best_s"] >= 0 for result in report["results"])
+
+    def test_writes_json_output(self, tmp_path):
+        output = tmp_path / "bench.json"
+
+        assert main([
+            "gap_detect", "--scale", "0.001", "--repeat", "1",
+            "--output", str(output)
+        ]) == 0
+        assert '"gap_detect.coverage_missing_s1"' in output.read_text()
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from src.cache import OHLCVCache
+from src.model import OHLCVBatch
+from src.timeframe import Timeframe
+
+PAIR = "dummy_pair"
+ROW_BYTES = 48
+
+
+def make_batch(timestamps):
+    values = np.asarray(timestamps, dtype=np.float64)
+    return OHLCVBatch(
+        np.asarray(timestamps, dtype=np.int64),
+        values, values, values, values, values
+    )
+
+
+@pytest.fixture
+def cache():
+    return OHLCVCache(100 * ROW_BYTES)
+
+
+class TestOHLCVCache:
+    def test_invalid_max_bytes_raises(self):
+        with pytest.raises(ValueError):
+            OHLCVCache(0)
+
+    def test_miss_on_empty_cache(self, cache):
+        assert cache.get(PAIR, Timeframe.MIN1, 0, 10) is None
+
+    def test_contained_request_is_sliced(self, cache):
+        cache.put(PAIR, Timeframe.MIN1, 0, 10, make_batch(range(11)), 0)
+
+        batch = cache.get(PAIR, Timeframe.MIN1, 3, 5)
+
+        np.testing.assert_array_equal(batch.timestamps, [3, 4, 5])
+        assert cache.get(PAIR, Timeframe.MIN1, 5, 11) is None
+        assert cache.get(PAIR, Timeframe.H1, 3, 5) is None
+
+    def test_returned_batches_are_copies(self, cache):
+        cache.put(PAIR, Timeframe.MIN1, 0, 10, make_batch(range(11)), 0)
+
+        cache.get(PAIR, Timeframe.MIN1, 0, 10).close[:] = -1
+
+        assert cache.get(PAIR, Timeframe.MIN1, 0, 10).close[0] == 0
+
+    def test_overlapping_segments_are_merged(self, cache):
+        cache.put(PAIR, Timeframe.MIN1, 0, 10, make_batch(range(0, 11)), 0)
+        cache.put(PAIR, Timeframe.MIN1, 21, 30, make_batch(range(21, 31)), 0)
+        cache.put(PAIR, Timeframe.MIN1, 5, 20, make_batch(range(5, 21)), 0)
+
+        assert len(cache) == 1
+        batch = cache.get(PAIR, Timeframe.MIN1, 0, 30)
+        np.testing.assert_array_equal(batch.timestamps, range(31))
+        assert cache.nbytes == 31 * ROW_BYTES
+
+    def test_lru_eviction_by_bytes(self, cache):
+        cache.put(PAIR, Timeframe.MIN1, 0, 49, make_batch(range(50)), 0)
+        cache.put(PAIR, Timeframe.H1, 0, 39, make_batch(range(40)), 0)
+        cache.get(PAIR, Timeframe.MIN1, 0, 1)
+        cache.put(PAIR, Timeframe.D1, 0, 29, make_batch(range(30)), 0)
+
+        assert cache.get(PAIR, Timeframe.H1, 0, 1) is None
+        assert cache.get(PAIR, Timeframe.MIN1, 0, 1) is not None
+        assert cache.get(PAIR, Timeframe.D1, 0, 1) is not None
+        assert cache.nbytes <= 100 * ROW_BYTES
+
+    def test_invalidate_drops_only_intersecting_segments(self, cache):
+        cache.put(PAIR, Timeframe.MIN1, 0, 10, make_batch(range(11)), 0)
+        cache.put(PAIR, Timeframe.MIN1, 20, 30, make_batch(range(20, 31)), 0)
+
+        cache.invalidate(PAIR, Timeframe.MIN1, 25, 40)
+
+        assert cache.get(PAIR, Timeframe.MIN1, 0, 10) is not None
+        assert cache.get(PAIR, Timeframe.MIN1, 20, 30) is None
+
+    def test_stale_generation_is_not_cached(self, cache):
+        generation = cache.generation(PAIR, Timeframe.MIN1)
+        cache.invalidate(PAIR, Timeframe.MIN1, 0, 10)
+
+        cache.put(
+            PAIR, Timeframe.MIN1, 0, 10, make_batch(range(11)), generation
+        )
+
+        assert cache.get(PAIR, Timeframe.MIN1, 0, 10) is None
@@ -0,0 +1,150 @@
+import io
+import json
+import argparse
+import pytest
+from decimal import Decimal
+from unittest.mock import MagicMock
+from datetime import datetime, timedelta, timezone
+
+from src.cli import (
+    BackfillJob, Checkpoint, _parse_datetime, _parse_timeframe, _read_pairs,
+    main, run_backfill
+)
+from src.manager import OHLCVManager
+from src.model import OHLCVBatch, OHLCVData
+from src.timeframe import Timeframe
+from src.warehouse import OHLCVWarehouse
+
+BASE = datetime(2024, 4, 20, 19, 0, 0, tzinfo=timezone.utc)
+
+
+def make_candles(count):
+    return [
+        OHLCVData(
+            timestamp=BASE + timedelta(minutes=5 * i),
+            open=Decimal("1.0"),
+            high=Decimal("2.0"),
+            low=Decimal("0.5"),
+            close=Decimal("1.5"),
+            volume=Decimal("100")
+        )
+        for i in range(count)
+    ]
+
+
+def fake_moralis(candles, failing=()):
+    def get_ohlcv_page(
+        pair_address, timeframe, currency, from_date, to_date,
+        limit=100, cursor=None
+    ):
+        if pair_address in failing:
+            raise RuntimeError("boom")
+        return OHLCVBatch.from_models([
+            c for c in candles if from_date <= c.timestamp <= to_date
+        ]), None
+
+    api = MagicMock(name="MoralisAPI")
+    api.get_ohlcv_page.side_effect = get_ohlcv_page
+    return api
+
+
+@pytest.fixture
+def job():
+    return BackfillJob(
+        ("pair_a", "pair_b"), (Timeframe.MIN5,),
+        BASE, BASE + timedelta(minutes=55)
+    )
+
+
+class TestArguments:
+    def test_timeframe_by_name_or_label(self):
+        assert _parse_timeframe("MIN5") == Timeframe.MIN5
+        assert _parse_timeframe("1h") == Timeframe.H1
+        with pytest.raises(argparse.ArgumentTypeError):
+            _parse_timeframe("2h")
+
+    def test_naive_datetime_is_utc(self):
+        assert _parse_datetime("2024-04-20T19:00:00") == BASE
+        assert _parse_datetime("2024-04-20T21:00:00+02:00") == BASE
+        with pytest.raises(argparse.ArgumentTypeError):
+            _parse_datetime("yesterday")
+
+    def test_pairs_file_skips_comments(self, tmp_path):
+        path = tmp_path / "pairs.txt"
+        path.write_text("pair_a\n# disabled\n\npair_b  # note\n")
+
+        assert _read_pairs(path) == ["pair_a", "pair_b"]
+
+    def test_missing_pairs_exit(self, tmp_path):
+        with pytest.raises(SystemExit):
+            main([
+                "backfill", "--timeframes", "MIN5",
+                "--start", "2024-04-20", "--end", "2024-04-21",
+                "--db-path", str(tmp_path)
+            ])
+
+    def test_foreign_checkpoint_exits(self, tmp_path, job):
+        path = tmp_path / "checkpoint.json"
+        path.write_text(json.dumps({"job": {"pairs": ["other"]}}))
+
+        with pytest.raises(SystemExit):
+            main([
+                "backfill", "--pairs", "pair_a", "--timeframes", "MIN5",
+                "--start", "2024-04-20", "--end", "2024-04-21",
+                "--db-path", str(tmp_path), "--checkpoint", str(path)
+            ])
+
+
+class TestRunBackfill:
+    def test_backfills_and_reports_throughput(self, tmp_path, job):
+        warehouse = OHLCVWarehouse(tmp_path / "ohlcv")
+        manager = OHLCVManager(fake_moralis(make_candles(12)), warehouse)
+        checkpoint = Checkpoint(tmp_path / "checkpoint.json", job)
+        out = io.StringIO()
+
+        assert run_backfill(manager, job, checkpoint, out=out) == 0
+
+        assert "candles/s" in out.getvalue()
+        assert "requests/s" in out.getvalue()
+        assert not (tmp_path / "checkpoint.json").exists()
+        for pair in job.pairs:
+            assert len(warehouse.load_ohlcv_data(
+                pair, Timeframe.MIN5, job.start, job.end
+            )) == 12
+
+    def test_resumes_from_checkpoint(self, tmp_path, job):
+        warehouse = OHLCVWarehouse(tmp_path / "ohlcv")
+        candles = make_candles(12)
+        path = tmp_path / "checkpoint.json"
+        manager = OHLCVManager(
+            fake_moralis(candles, failing={"pair_b"}), warehouse
+        )
+
+        assert run_backfill(
+            manager, job, Checkpoint(path, job), out=io.StringIO()
+        ) == 1
+        state = json.loads(path.read_text())
+        assert {window[0] for window in state["completed"]} == {"pair_a"}
+        assert state["candles"] == 12
+
+        api = fake_moralis(candles)
+        checkpoint = Checkpoint(path, job)
+        assert checkpoint.load()
+        manager = OHLCVManager(api, warehouse)
+
+        assert run_backfill(
+            manager, job, checkpoint, out=io.StringIO()
+        ) == 0
+        assert {
+            call.kwargs["pair_address"]
+            for call in api.get_ohlcv_page.call_args_list
+        } == {"pair_b"}
+        assert not path.exists()
+
+    def test_checkpoint_rejects_other_job(self, tmp_path, job):
+        path = tmp_path / "checkpoint.json"
+        Checkpoint(path, job).save()
+        other = BackfillJob(("pair_c",), job.timeframes, job.start, job.end)
+
+        with pytest.raises(ValueError):
+            Checkpoint(path, other).load()
@@ -0,0 +1,50 @@
+import numpy as np
+
+from src.coverage import Coverage
+
+
+class TestCoverage:
+    def test_empty_coverage_is_all_missing(self):
+        assert Coverage().missing(0, 10) == [(0, 10)]
+
+    def test_add_merges_overlapping_and_adjacent(self):
+        coverage = Coverage()
+        coverage.add(0, 10)
+        coverage.add(20, 30)
+        coverage.add(10, 15)
+        coverage.add(25, 40)
+
+        assert coverage.intervals == [(0, 15), (20, 40)]
+
+    def test_add_bridges_intervals(self):
+        coverage = Coverage([(0, 10), (20, 30), (40, 50)])
+        coverage.add(5, 45)
+
+        assert coverage.intervals == [(0, 50)]
+
+    def test_add_ignores_empty_interval(self):
+        coverage = Coverage()
+        coverage.add(10, 10)
+
+        assert len(coverage) == 0
+
+    def test_missing_returns_holes_within_range(self):
+        coverage = Coverage([(10, 20), (30, 40)])
+
+        assert coverage.missing(0, 50) == [(0, 10), (20, 30), (40, 50)]
+        assert coverage.missing(15, 35) == [(20, 30)]
+        assert coverage.missing(12, 18) == []
+
+    def test_missing_of_empty_range(self):
+        assert Coverage().missing(10, 10) == []
+
+    def test_array_round_trip(self):
+        coverage = Coverage([(0, 10), (20, 30)])
+        array = coverage.to_array()
+
+        assert array.dtype == np.int64
+        assert array.shape == (2, 2)
+        assert Coverage.from_array(array).intervals == coverage.intervals
+
+    def test_empty_array_round_trip(self):
+        assert Coverage.from_array(Coverage().to_array()).intervals == []
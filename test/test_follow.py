@@ -0,0 +1,157 @@
+import numpy as np
+import pytest
+from decimal import Decimal
+from unittest.mock import MagicMock
+from datetime import datetime, timedelta, timezone
+
+from src.follow import _RingBuffer
+from src.manager import OHLCVManager
+from src.model import OHLCVBatch, OHLCVData
+from src.timeframe import Timeframe
+from src.warehouse import OHLCVWarehouse
+
+PAIR = "dummy_pair"
+
+
+def make_candle(timestamp, close="1.5"):
+    return OHLCVData(
+        timestamp=timestamp,
+        open=Decimal("1.0"),
+        high=Decimal("2.0"),
+        low=Decimal("0.5"),
+        close=Decimal(close),
+        volume=Decimal("100")
+    )
+
+
+def make_batch(timestamps):
+    values = np.arange(len(timestamps), dtype=np.float64)
+    return OHLCVBatch(
+        np.array(timestamps, dtype=np.int64),
+        values, values, values, values, values
+    )
+
+
+def fake_moralis(candles, page_size=3):
+    def get_ohlcv_page(
+        pair_address, timeframe, currency, from_date, to_date,
+        limit=100, cursor=None
+    ):
+        matching = [
+            c for c in candles if from_date <= c.timestamp <= to_date
+        ]
+        served = int(cursor or 0)
+        page = matching[:len(matching) - served][-min(limit, page_size):]
+        served += len(page)
+        next_cursor = str(served) if served < len(matching) else None
+        return OHLCVBatch.from_models(page), next_cursor
+
+    api = MagicMock(name="MoralisAPI")
+    api.get_ohlcv_page.side_effect = get_ohlcv_page
+    return api
+
+
+@pytest.fixture
+def forming():
+    now = datetime.now(timezone.utc)
+    return now.replace(minute=0, second=0, microsecond=0)
+
+
+@pytest.fixture
+def warehouse(tmp_path):
+    return OHLCVWarehouse(tmp_path / "ohlcv")
+
+
+class TestRingBuffer:
+    def test_extend_evicts_oldest(self):
+        ring = _RingBuffer(3)
+        ring.extend(make_batch([1, 2]))
+        ring.extend(make_batch([3, 4]))
+
+        assert len(ring) == 3
+        np.testing.assert_array_equal(ring.view().timestamps, [2, 3, 4])
+
+    def test_oversized_batch_keeps_newest(self):
+        ring = _RingBuffer(2)
+        ring.extend(make_batch([1, 2, 3, 4]))
+
+        np.testing.assert_array_equal(ring.view().timestamps, [3, 4])
+
+    def test_truncate_and_drop(self):
+        ring = _RingBuffer(4)
+        ring.extend(make_batch([1, 2, 3, 4]))
+        ring.truncate_from(4)
+        ring.drop_before(2)
+        ring.extend(make_batch([5, 6]))
+
+        np.testing.assert_array_equal(ring.view().timestamps, [2, 3, 5, 6])
+
+    def test_view_is_contiguous_after_wrap(self):
+        ring = _RingBuffer(3)
+        for timestamp in range(10):
+            ring.extend(make_batch([timestamp]))
+
+        view = ring.view()
+        np.testing.assert_array_equal(view.timestamps, [7, 8, 9])
+        assert view.timestamps.base is not None
+
+
+class TestOHLCVFollower:
+    def test_invalid_window_raises(self, warehouse):
+        manager = OHLCVManager(MagicMock(), warehouse)
+
+        with pytest.raises(ValueError):
+            manager.follow(PAIR, Timeframe.H1, timedelta(minutes=5))
+
+    def test_first_poll_loads_window(self, warehouse, forming):
+        candles = [
+            make_candle(forming - timedelta(hours=i)) for i in range(8)
+        ][::-1]
+        manager = OHLCVManager(fake_moralis(candles), warehouse)
+
+        df = manager.follow(PAIR, Timeframe.H1, timedelta(hours=4)).poll()
+
+        assert df.index[0] == forming - timedelta(hours=3)
+        assert df.index[-1] == forming
+        assert len(df) == 4
+
+    def test_poll_replaces_forming_candle(self, warehouse, forming):
+        candles = [
+            make_candle(forming - timedelta(hours=i)) for i in range(5)
+        ][::-1]
+        api = fake_moralis(candles)
+        manager = OHLCVManager(api, warehouse)
+        follower = manager.follow(PAIR, Timeframe.H1, timedelta(hours=4))
+        follower.poll()
+        api.get_ohlcv_page.reset_mock()
+
+        candles[-1] = make_candle(forming, close="9.5")
+        df = follower.poll()
+
+        assert len(df) == 4
+        assert df.index.is_unique
+        assert df["close"].iloc[-1] == 9.5
+        assert api.get_ohlcv_page.call_count == 1
+        assert api.get_ohlcv_page.call_args.kwargs["from_date"] == forming
+
+    def test_poll_fetches_only_new_candles(self, warehouse, forming):
+        candles = [
+            make_candle(forming - timedelta(hours=i)) for i in range(2, 6)
+        ][::-1]
+        api = fake_moralis(candles)
+        manager = OHLCVManager(api, warehouse)
+        follower = manager.follow(PAIR, Timeframe.H1, timedelta(hours=4))
+        assert len(follower.poll()) == 2
+        api.get_ohlcv_page.reset_mock()
+
+        candles.extend([
+            make_candle(forming - timedelta(hours=1)), make_candle(forming)
+        ])
+        df = follower.poll()
+
+        assert list(df.index) == [
+            forming - timedelta(hours=i) for i in range(3, -1, -1)
+        ]
+        assert api.get_ohlcv_page.call_args.kwargs["from_date"] == (
+            forming - timedelta(hours=1)
+        )
@@ -1,8 +1,52 @@
-
+import time
+import asyncio
 import pytest
-from unittest.mock import MagicMock
+import threading
+import pandas as pd
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+from datetime import datetime, timedelta, timezone
 
 from src.manager import OHLCVManager
+from src.warehouse import OHLCVWarehouse
+from src.timeframe import Timeframe
+from src.model import OHLCVBatch, OHLCVData
+
+PAIR = "dummy_pair"
+BASE = datetime(2024, 4, 20, 19, 0, 0, tzinfo=timezone.utc)
+
+
+def make_candles(timestamps):
+    return [
+        OHLCVData(
+            timestamp=ts,
+            open=Decimal("1.0"),
+            high=Decimal("2.0"),
+            low=Decimal("0.5"),
+            close=Decimal("1.5"),
+            volume=Decimal("100")
+        )
+        for ts in timestamps
+    ]
+
+
+def fake_moralis(candles, page_size=3):
+    def get_ohlcv_page(
+        pair_address, timeframe, currency, from_date, to_date,
+        limit=100, cursor=None
+    ):
+        matching = [
+            c for c in candles if from_date <= c.timestamp <= to_date
+        ]
+        served = int(cursor or 0)
+        page = matching[:len(matching) - served][-min(limit, page_size):]
+        served += len(page)
+        next_cursor = str(served) if served < len(matching) else None
+        return OHLCVBatch.from_models(page), next_cursor
+
+    api = MagicMock(name="MoralisAPI")
+    api.get_ohlcv_page.side_effect = get_ohlcv_page
+    return api
 
 
 @pytest.fixture
@@ -13,41 +57,685 @@ def ohlcv_manager(monkeypatch):
     return manager, fake_api, fake_warehouse
 
 
-class TestTimestampsToSpans:
-    @pytest.mark.skip
-    def test_no_gap(self, ohlcv_manager):
-        pass
+@pytest.fixture
+def warehouse(tmp_path):
+    return OHLCVWarehouse(tmp_path / "ohlcv")
 
-    @pytest.mark.skip
-    def test_single_gap(self, ohlcv_manager):
-        pass
 
-    @pytest.mark.skip
-    def test_multiple_gaps(self, ohlcv_manager):
-        pass
+class TestBucketBounds:
+    def test_aligns_to_bucket_grid(self, ohlcv_manager):
+        manager, _, _ = ohlcv_manager
+        start, end = manager._bucket_bounds(
+            Timeframe.MIN5,
+            BASE + timedelta(minutes=2), BASE + timedelta(minutes=11)
+        )
+        assert start == BASE
+        assert end == BASE + timedelta(minutes=15)
 
-    @pytest.mark.skip
-    def test_no_data(self, ohlcv_manager):
-        pass
+    def test_naive_and_aware_inputs_agree(self, ohlcv_manager):
+        manager, _, _ = ohlcv_manager
+        naive = manager._bucket_bounds(
+            Timeframe.H1, datetime(2024, 4, 20, 19), datetime(2024, 4, 20, 21)
+        )
+        aware = manager._bucket_bounds(
+            Timeframe.H1, BASE, BASE + timedelta(hours=2)
+        )
+        assert naive == aware
 
 
 class TestToUTC:
-    pass
+    def test_naive_is_assumed_utc(self, ohlcv_manager):
+        manager, _, _ = ohlcv_manager
+        assert manager._to_utc(datetime(2024, 4, 20, 19)) == BASE
+
+    def test_aware_is_converted(self, ohlcv_manager):
+        manager, _, _ = ohlcv_manager
+        offset = timezone(timedelta(hours=2))
+        dt = datetime(2024, 4, 20, 21, tzinfo=offset)
+        assert manager._to_utc(dt) == BASE
+        assert manager._to_utc(dt).tzinfo == timezone.utc
 
 
 class TestFetchOHLCVData:
-    pass
+    def test_paginates_backwards_until_empty(self, warehouse):
+        candles = make_candles(
+            [BASE + timedelta(minutes=5 * i) for i in range(10)]
+        )
+        api = fake_moralis(candles)
+        manager = OHLCVManager(api, warehouse)
+
+        data = manager._fetch_ohlcv_data(
+            PAIR, Timeframe.MIN5, BASE, BASE + timedelta(minutes=45)
+        )
+
+        assert isinstance(data, OHLCVBatch)
+        assert sorted(data.timestamps) == list(
+            OHLCVBatch.from_models(candles).timestamps
+        )
+        assert api.get_ohlcv_page.call_count == 4
+        assert manager.requests_sent == 4
+
+    def test_follows_server_cursor(self, warehouse):
+        candles = make_candles(
+            [BASE + timedelta(minutes=5 * i) for i in range(10)]
+        )
+        api = fake_moralis(candles)
+        manager = OHLCVManager(api, warehouse)
+
+        data = manager._fetch_ohlcv_data(
+            PAIR, Timeframe.MIN5, BASE, BASE + timedelta(minutes=45)
+        )
+
+        assert len(data) == 10
+        calls = api.get_ohlcv_page.call_args_list
+        assert [call.kwargs["cursor"] for call in calls] == [
+            None, "3", "6", "9"
+        ]
+        assert {call.kwargs["to_date"] for call in calls} == {
+            BASE + timedelta(minutes=45)
+        }
+
+    def test_page_limit_is_sized_to_the_span(self, warehouse):
+        candles = make_candles(
+            [BASE + timedelta(minutes=5 * i) for i in range(12)]
+        )
+        api = fake_moralis(candles, page_size=1000)
+        manager = OHLCVManager(api, warehouse, max_page_size=10)
+
+        manager._fetch_ohlcv_data(
+            PAIR, Timeframe.MIN5, BASE, BASE + timedelta(minutes=25)
+        )
+        manager._fetch_ohlcv_data(
+            PAIR, Timeframe.MIN5, BASE, BASE + timedelta(minutes=55)
+        )
+
+        limits = [
+            call.kwargs["limit"] for call in api.get_ohlcv_page.call_args_list
+        ]
+        assert limits == [6, 10, 10]
+
+    def test_partial_page_ends_pagination(self, warehouse):
+        candles = make_candles(
+            [BASE + timedelta(minutes=5 * i) for i in range(6, 12)]
+        )
+        api = fake_moralis(candles, page_size=1000)
+        manager = OHLCVManager(api, warehouse)
+
+        data = manager._fetch_ohlcv_data(
+            PAIR, Timeframe.MIN5, BASE, BASE + timedelta(minutes=55)
+        )
+
+        assert len(data) == 6
+        assert api.get_ohlcv_page.call_count == 1
+
+    def test_invalid_max_page_size_raises(self, warehouse):
+        with pytest.raises(ValueError):
+            OHLCVManager(MagicMock(), warehouse, max_page_size=0)
+
+    def test_large_gaps_are_split_into_windows(self, warehouse):
+        candles = make_candles(
+            [BASE + timedelta(minutes=5 * i) for i in range(12)]
+        )
+        api = fake_moralis(candles, page_size=1000)
+        manager = OHLCVManager(api, warehouse, max_page_size=4)
+
+        df = manager.get_ohlcv_data(
+            PAIR, Timeframe.MIN5, BASE, BASE + timedelta(minutes=55)
+        )
+
+        assert len(df) == 12
+        assert sorted(
+            call.kwargs["from_date"]
+            for call in api.get_ohlcv_page.call_args_list
+        ) == [BASE + timedelta(minutes=20 * i) for i in range(3)]
 
 
 class TestGetOHLCVData:
-    @pytest.mark.skip
-    def test_full_data(self):
-        pass
+    def test_full_data(self, warehouse):
+        candles = make_candles(
+            [BASE + timedelta(minutes=5 * i) for i in range(12)]
+        )
+        api = fake_moralis(candles)
+        manager = OHLCVManager(api, warehouse)
+        end = BASE + timedelta(minutes=55)
+
+        first = manager.get_ohlcv_data(PAIR, Timeframe.MIN5, BASE, end)
+        calls = api.get_ohlcv_page.call_count
+        second = manager.get_ohlcv_data(PAIR, Timeframe.MIN5, BASE, end)
+
+        assert len(first) == 12
+        assert second.equals(first)
+        assert api.get_ohlcv_page.call_count == calls
+
+    def test_no_data(self, warehouse):
+        api = fake_moralis([])
+        manager = OHLCVManager(api, warehouse)
+        end = BASE + timedelta(hours=1)
+
+        df = manager.get_ohlcv_data(PAIR, Timeframe.MIN5, BASE, end)
+
+        assert df.empty
+        assert api.get_ohlcv_page.call_count == 1
+
+    def test_partial_data(self, warehouse):
+        candles = make_candles(
+            [BASE + timedelta(minutes=5 * i) for i in range(12)]
+        )
+        warehouse.store_ohlcv_data(PAIR, Timeframe.MIN5, candles[:6])
+        warehouse.mark_covered(
+            PAIR, Timeframe.MIN5, BASE, BASE + timedelta(minutes=30)
+        )
+        api = fake_moralis(candles)
+        manager = OHLCVManager(api, warehouse)
+
+        df = manager.get_ohlcv_data(
+            PAIR, Timeframe.MIN5, BASE, BASE + timedelta(minutes=55)
+        )
+
+        assert len(df) == 12
+        for call in api.get_ohlcv_page.call_args_list:
+            assert call.kwargs["from_date"] >= BASE + timedelta(minutes=30)
+
+    def test_interior_empty_buckets_are_not_refetched(self, warehouse):
+        candles = make_candles([
+            BASE, BASE + timedelta(minutes=5), BASE + timedelta(minutes=25)
+        ])
+        api = fake_moralis(candles)
+        manager = OHLCVManager(api, warehouse)
+        end = BASE + timedelta(minutes=25)
+
+        manager.get_ohlcv_data(PAIR, Timeframe.MIN5, BASE, end)
+        calls = api.get_ohlcv_page.call_count
+        df = manager.get_ohlcv_data(PAIR, Timeframe.MIN5, BASE, end)
+
+        assert len(df) == 3
+        assert api.get_ohlcv_page.call_count == calls
+
+    def test_forming_bucket_is_not_marked_covered(self, warehouse):
+        now = datetime.now(timezone.utc)
+        start = now - timedelta(minutes=3)
+        candles = make_candles([start, now])
+        api = fake_moralis(candles)
+        manager = OHLCVManager(api, warehouse)
+
+        manager.get_ohlcv_data(PAIR, Timeframe.MIN1, start, now)
+
+        assert warehouse.missing_spans(
+            PAIR, Timeframe.MIN1, *manager._bucket_bounds(
+                Timeframe.MIN1, now, now
+            )
+        )
+
+    def test_settled_empty_span_is_not_refetched(self, warehouse):
+        api = fake_moralis([])
+        manager = OHLCVManager(api, warehouse)
+        end = BASE + timedelta(hours=1)
+
+        manager.get_ohlcv_data(PAIR, Timeframe.MIN5, BASE, end)
+        df = manager.get_ohlcv_data(PAIR, Timeframe.MIN5, BASE, end)
+
+        assert df.empty
+        assert api.get_ohlcv_page.call_count == 1
+
+    def test_settled_empty_tail_is_not_refetched(self, warehouse):
+        candles = make_candles([BASE, BASE + timedelta(minutes=5)])
+        api = fake_moralis(candles)
+        manager = OHLCVManager(api, warehouse)
+        end = BASE + timedelta(hours=1)
+
+        manager.get_ohlcv_data(PAIR, Timeframe.MIN5, BASE, end)
+        calls = api.get_ohlcv_page.call_count
+        df = manager.get_ohlcv_data(PAIR, Timeframe.MIN5, BASE, end)
+
+        assert len(df) == 2
+        assert api.get_ohlcv_page.call_count == calls
+
+    def test_unsettled_empty_span_is_refetched(self, warehouse):
+        api = fake_moralis([])
+        manager = OHLCVManager(
+            api, warehouse, settle_horizon=timedelta(hours=1)
+        )
+        end = datetime.now(timezone.utc)
+        start = end - timedelta(minutes=30)
+
+        manager.get_ohlcv_data(PAIR, Timeframe.MIN5, start, end)
+        manager.get_ohlcv_data(PAIR, Timeframe.MIN5, start, end)
+
+        assert api.get_ohlcv_page.call_count == 2
+
+    def test_settle_horizon_splits_recent_empty_span(self, warehouse):
+        api = fake_moralis([])
+        manager = OHLCVManager(
+            api, warehouse, settle_horizon=timedelta(minutes=30)
+        )
+        end = datetime.now(timezone.utc)
+        start = end - timedelta(hours=2)
+
+        manager.get_ohlcv_data(PAIR, Timeframe.MIN5, start, end)
+        span_start, span_end = manager._bucket_bounds(
+            Timeframe.MIN5, start, end
+        )
+        (gap_start, gap_end), = warehouse.missing_spans(
+            PAIR, Timeframe.MIN5, span_start, span_end
+        )
+
+        assert gap_start > span_start
+        assert end - gap_start <= timedelta(minutes=40)
+        assert gap_end == span_end
+
+
+class TestConcurrentGapFilling:
+    def test_invalid_pool_settings_raise(self, warehouse):
+        with pytest.raises(ValueError):
+            OHLCVManager(MagicMock(), warehouse, max_workers=0)
+        with pytest.raises(ValueError):
+            OHLCVManager(MagicMock(), warehouse, max_in_flight=0)
+
+    def test_gaps_are_filled_in_parallel_within_limit(self, warehouse):
+        candles = make_candles(
+            [BASE + timedelta(minutes=5 * i) for i in range(24)]
+        )
+        for i in range(0, 24, 4):
+            warehouse.mark_covered(
+                PAIR, Timeframe.MIN5,
+                BASE + timedelta(minutes=5 * i),
+                BASE + timedelta(minutes=5 * (i + 2))
+            )
+
+        lock = threading.Lock()
+        in_flight = 0
+        peak = 0
+        fake = fake_moralis(candles).get_ohlcv_page.side_effect
+
+        def slow_fetch(*args, **kwargs):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.05)
+            with lock:
+                in_flight -= 1
+            return fake(*args, **kwargs)
+
+        api = MagicMock(name="MoralisAPI")
+        api.get_ohlcv_page.side_effect = slow_fetch
+        manager = OHLCVManager(api, warehouse, max_workers=8, max_in_flight=3)
+
+        df = manager.get_ohlcv_data(
+            PAIR, Timeframe.MIN5, BASE, BASE + timedelta(minutes=115)
+        )
+        manager.close()
+
+        assert len(df) == 12
+        assert 1 < peak <= 3
+
+    def test_fetch_errors_propagate(self, warehouse):
+        api = MagicMock(name="MoralisAPI")
+        api.get_ohlcv_page.side_effect = RuntimeError("boom")
+        manager = OHLCVManager(api, warehouse)
+
+        with pytest.raises(RuntimeError, match="boom"):
+            manager.get_ohlcv_data(
+                PAIR, Timeframe.MIN5, BASE, BASE + timedelta(hours=1)
+            )
+
+
+class TestRequestCoalescing:
+    def slow_api(self, candles, entered):
+        fake = fake_moralis(candles).get_ohlcv_page.side_effect
+
+        def slow_fetch(*args, **kwargs):
+            entered.set()
+            time.sleep(0.1)
+            return fake(*args, **kwargs)
+
+        api = MagicMock(name="MoralisAPI")
+        api.get_ohlcv_page.side_effect = slow_fetch
+        return api
+
+    def test_concurrent_identical_requests_share_fetches(self, warehouse):
+        candles = make_candles(
+            [BASE + timedelta(minutes=5 * i) for i in range(6)]
+        )
+        entered = threading.Event()
+        api = self.slow_api(candles, entered)
+        manager = OHLCVManager(api, warehouse)
+        end = BASE + timedelta(minutes=25)
+        results = []
+
+        def request():
+            results.append(
+                manager.get_ohlcv_data(PAIR, Timeframe.MIN5, BASE, end)
+            )
+
+        first = threading.Thread(target=request)
+        first.start()
+        entered.wait()
+        others = [threading.Thread(target=request) for _ in range(4)]
+        for thread in others:
+            thread.start()
+        for thread in [first, *others]:
+            thread.join()
+
+        assert api.get_ohlcv_page.call_count == 2
+        assert all(len(df) == 6 for df in results)
+
+    def test_overlapping_request_fetches_only_the_remainder(self, warehouse):
+        candles = make_candles(
+            [BASE + timedelta(minutes=5 * i) for i in range(12)]
+        )
+        entered = threading.Event()
+        api = self.slow_api(candles, entered)
+        manager = OHLCVManager(api, warehouse)
+
+        first = threading.Thread(target=manager.get_ohlcv_data, args=(
+            PAIR, Timeframe.MIN5, BASE, BASE + timedelta(minutes=25)
+        ))
+        first.start()
+        entered.wait()
+        df = manager.get_ohlcv_data(
+            PAIR, Timeframe.MIN5, BASE, BASE + timedelta(minutes=55)
+        )
+        first.join()
+
+        assert len(df) == 12
+        from_dates = {
+            call.kwargs["from_date"]
+            for call in api.get_ohlcv_page.call_args_list
+        }
+        assert from_dates == {BASE, BASE + timedelta(minutes=30)}
+
+    def test_shared_fetch_errors_reach_every_waiter(self, warehouse):
+        entered = threading.Event()
+
+        def failing_fetch(*args, **kwargs):
+            entered.set()
+            time.sleep(0.1)
+            raise RuntimeError("boom")
+
+        api = MagicMock(name="MoralisAPI")
+        api.get_ohlcv_page.side_effect = failing_fetch
+        manager = OHLCVManager(api, warehouse)
+        end = BASE + timedelta(minutes=25)
+        errors = []
+
+        def request():
+            try:
+                manager.get_ohlcv_data(PAIR, Timeframe.MIN5, BASE, end)
+            except RuntimeError as e:
+                errors.append(e)
+
+        first = threading.Thread(target=request)
+        first.start()
+        entered.wait()
+        request()
+        first.join()
+
+        assert len(errors) == 2
+        assert api.get_ohlcv_page.call_count == 1
+
+
+class TestGetOHLCVDataMany:
+    def test_returns_frame_per_pair(self, warehouse):
+        candles = make_candles(
+            [BASE + timedelta(minutes=5 * i) for i in range(12)]
+        )
+        api = fake_moralis(candles)
+        manager = OHLCVManager(api, warehouse)
+        end = BASE + timedelta(minutes=55)
+
+        frames = manager.get_ohlcv_data_many(
+            ["pair_a", "pair_b", "pair_a"], Timeframe.MIN5, BASE, end
+        )
+
+        assert list(frames) == ["pair_a", "pair_b"]
+        assert all(len(frame) == 12 for frame in frames.values())
+        pairs = {
+            call.kwargs["pair_address"]
+            for call in api.get_ohlcv_page.call_args_list
+        }
+        assert pairs == {"pair_a", "pair_b"}
+
+    def test_as_frame_returns_multi_index(self, warehouse):
+        candles = make_candles(
+            [BASE + timedelta(minutes=5 * i) for i in range(6)]
+        )
+        manager = OHLCVManager(fake_moralis(candles), warehouse)
+
+        df = manager.get_ohlcv_data_many(
+            ["pair_a", "pair_b"], Timeframe.MIN5,
+            BASE, BASE + timedelta(minutes=25), as_frame=True
+        )
+
+        assert df.index.names == ["pair", "timestamp"]
+        assert len(df.loc["pair_a"]) == 6
+        assert len(df.loc["pair_b"]) == 6
+
+    def test_pairs_share_one_in_flight_budget(self, warehouse):
+        candles = make_candles(
+            [BASE + timedelta(minutes=5 * i) for i in range(12)]
+        )
+        lock = threading.Lock()
+        in_flight = 0
+        peak = 0
+        fake = fake_moralis(candles).get_ohlcv_page.side_effect
+
+        def slow_fetch(*args, **kwargs):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.05)
+            with lock:
+                in_flight -= 1
+            return fake(*args, **kwargs)
+
+        api = MagicMock(name="MoralisAPI")
+        api.get_ohlcv_page.side_effect = slow_fetch
+        manager = OHLCVManager(api, warehouse, max_workers=8, max_in_flight=2)
+
+        frames = manager.get_ohlcv_data_many(
+            [f"pair_{i}" for i in range(6)], Timeframe.MIN5,
+            BASE, BASE + timedelta(minutes=55)
+        )
+        manager.close()
+
+        assert all(len(frame) == 12 for frame in frames.values())
+        assert 1 < peak <= 2
+
+
+class TestResampling:
+    def test_coarse_data_is_derived_without_api_calls(self, warehouse):
+        fine = make_candles(
+            [BASE + timedelta(minutes=5 * i) for i in range(24)]
+        )
+        OHLCVManager(fake_moralis(fine), warehouse).get_ohlcv_data(
+            PAIR, Timeframe.MIN5, BASE, BASE + timedelta(minutes=115)
+        )
+        api = MagicMock(name="MoralisAPI")
+        manager = OHLCVManager(api, warehouse, resample=True)
+
+        df = manager.get_ohlcv_data(
+            PAIR, Timeframe.H1, BASE, BASE + timedelta(hours=1)
+        )
+
+        api.get_ohlcv_page.assert_not_called()
+        assert list(df.index) == [BASE, BASE + timedelta(hours=1)]
+        assert (df["volume"] == 1200).all()
+        assert warehouse.missing_spans(
+            PAIR, Timeframe.H1, BASE, BASE + timedelta(hours=2)
+        ) == []
+
+    def test_uncovered_remainder_is_fetched(self, warehouse):
+        fine = make_candles(
+            [BASE + timedelta(minutes=5 * i) for i in range(12)]
+        )
+        OHLCVManager(fake_moralis(fine), warehouse).get_ohlcv_data(
+            PAIR, Timeframe.MIN5, BASE, BASE + timedelta(minutes=55)
+        )
+        coarse = make_candles([BASE + timedelta(hours=i) for i in range(3)])
+        api = fake_moralis(coarse)
+        manager = OHLCVManager(api, warehouse, resample=True)
+
+        df = manager.get_ohlcv_data(
+            PAIR, Timeframe.H1, BASE, BASE + timedelta(hours=2)
+        )
+
+        assert len(df) == 3
+        assert df["volume"].iloc[0] == 1200
+        assert all(
+            call.kwargs["from_date"] == BASE + timedelta(hours=1)
+            for call in api.get_ohlcv_page.call_args_list
+        )
+
+    def test_disabled_by_default(self, warehouse):
+        fine = make_candles(
+            [BASE + timedelta(minutes=5 * i) for i in range(12)]
+        )
+        OHLCVManager(fake_moralis(fine), warehouse).get_ohlcv_data(
+            PAIR, Timeframe.MIN5, BASE, BASE + timedelta(minutes=55)
+        )
+        api = fake_moralis(make_candles([BASE]))
+        manager = OHLCVManager(api, warehouse)
+
+        manager.get_ohlcv_data(PAIR, Timeframe.H1, BASE, BASE)
+
+        api.get_ohlcv_page.assert_called()
+
+
+class TestCachedLoads:
+    def test_invalid_cache_bytes_raises(self, warehouse):
+        with pytest.raises(ValueError):
+            OHLCVManager(MagicMock(), warehouse, cache_bytes=-1)
+
+    def test_contained_request_skips_warehouse(self, warehouse):
+        candles = make_candles(
+            [BASE + timedelta(minutes=5 * i) for i in range(12)]
+        )
+        manager = OHLCVManager(
+            fake_moralis(candles), warehouse, cache_bytes=1 << 20
+        )
+        end = BASE + timedelta(minutes=55)
+        full = manager.get_ohlcv_data(PAIR, Timeframe.MIN5, BASE, end)
+        warehouse.load_ohlcv_data = MagicMock(
+            side_effect=AssertionError("warehouse read")
+        )
+
+        df = manager.get_ohlcv_data(
+            PAIR, Timeframe.MIN5,
+            BASE + timedelta(minutes=10), BASE + timedelta(minutes=20)
+        )
+
+        assert df.equals(full.iloc[2:5])
+
+    def test_store_invalidates_cached_range(self, warehouse):
+        candles = make_candles(
+            [BASE + timedelta(minutes=5 * i) for i in range(12)]
+        )
+        manager = OHLCVManager(
+            fake_moralis(candles), warehouse, cache_bytes=1 << 20
+        )
+        end = BASE + timedelta(minutes=55)
+        manager.get_ohlcv_data(PAIR, Timeframe.MIN5, BASE, end)
+
+        update = OHLCVBatch.from_models(candles[3:4])
+        update.close[:] = 9.0
+        warehouse.store_ohlcv_data(PAIR, Timeframe.MIN5, update)
+        df = manager.get_ohlcv_data(PAIR, Timeframe.MIN5, BASE, end)
+
+        assert df["close"].iloc[3] == 9.0
+        manager.close()
+
+
+class TestAsyncGetOHLCVData:
+    def test_fills_gaps_and_serves_cached(self, warehouse):
+        candles = make_candles(
+            [BASE + timedelta(minutes=5 * i) for i in range(12)]
+        )
+        fake = fake_moralis(candles).get_ohlcv_page.side_effect
+        async_api = MagicMock(name="AsyncMoralisAPI")
+        async_api.get_ohlcv_page = AsyncMock(side_effect=fake)
+        async_api.close = AsyncMock()
+        manager = OHLCVManager(
+            MagicMock(), warehouse, async_moralis_api=async_api
+        )
+        end = BASE + timedelta(minutes=55)
+
+        async def run():
+            first = await manager.aget_ohlcv_data(
+                PAIR, Timeframe.MIN5, BASE, end
+            )
+            calls = async_api.get_ohlcv_page.await_count
+            second = await manager.aget_ohlcv_data(
+                PAIR, Timeframe.MIN5, BASE, end
+            )
+            await manager.aclose()
+            return first, second, calls
+
+        first, second, calls = asyncio.run(run())
+
+        assert len(first) == 12
+        assert second.equals(first)
+        assert async_api.get_ohlcv_page.await_count == calls
+        async_api.close.assert_awaited_once()
+
+
+class TestIterOHLCVData:
+    def test_invalid_chunk_raises(self, warehouse):
+        manager = OHLCVManager(fake_moralis([]), warehouse)
+
+        with pytest.raises(ValueError):
+            next(manager.iter_ohlcv_data(
+                PAIR, Timeframe.MIN5, BASE, BASE + timedelta(hours=1), chunk=0
+            ))
+
+    def test_yields_chunks_in_time_order(self, warehouse):
+        candles = make_candles(
+            [BASE + timedelta(minutes=5 * i) for i in range(12)]
+        )
+        manager = OHLCVManager(fake_moralis(candles), warehouse)
+
+        chunks = list(manager.iter_ohlcv_data(
+            PAIR, Timeframe.MIN5, BASE, BASE + timedelta(minutes=55), chunk=5
+        ))
+
+        assert [len(chunk) for chunk in chunks] == [5, 5, 2]
+        index = pd.concat(chunks).index
+        assert index.is_monotonic_increasing
+        assert index.is_unique
+        assert len(index) == 12
+
+    def test_respects_unaligned_bounds(self, warehouse):
+        candles = make_candles(
+            [BASE + timedelta(minutes=5 * i) for i in range(12)]
+        )
+        manager = OHLCVManager(fake_moralis(candles), warehouse)
+
+        chunks = list(manager.iter_ohlcv_data(
+            PAIR, Timeframe.MIN5,
+            BASE + timedelta(minutes=7), BASE + timedelta(minutes=33),
+            chunk=2
+        ))
+
+        index = pd.concat(chunks).index
+        assert index[0] == BASE + timedelta(minutes=10)
+        assert index[-1] == BASE + timedelta(minutes=30)
+
+    def test_gaps_are_filled_lazily(self, warehouse):
+        candles = make_candles(
+            [BASE + timedelta(minutes=5 * i) for i in range(12)]
+        )
+        api = fake_moralis(candles)
+        manager = OHLCVManager(api, warehouse)
 
-    @pytest.mark.skip
-    def test_no_data(self):
-        pass
+        chunks = manager.iter_ohlcv_data(
+            PAIR, Timeframe.MIN5, BASE, BASE + timedelta(minutes=55), chunk=4
+        )
+        first = next(chunks)
 
-    @pytest.mark.skip
-    def test_partial_data(self):
-        pass
+        assert len(first) == 4
+        latest = max(
+            call.kwargs["to_date"]
+            for call in api.get_ohlcv_page.call_args_list
+        )
+        assert latest < BASE + timedelta(minutes=20)
@@ -0,0 +1,99 @@
+import pytest
+import numpy as np
+from decimal import Decimal
+from datetime import datetime, timedelta, timezone
+
+from src.model import OHLCVBatch, OHLCVData
+
+BASE = datetime(2024, 4, 20, 19, 0, 0, tzinfo=timezone.utc)
+
+
+def make_batch(count, start=0):
+    timestamps = (
+        np.arange(start, start + count, dtype=np.int64) * 300 * 10**9
+        + int(BASE.timestamp()) * 10**9
+    )
+    values = np.arange(start, start + count, dtype=np.float64)
+    return OHLCVBatch(timestamps, values, values, values, values, values)
+
+
+class TestOHLCVBatch:
+    def test_columns_are_typed_and_contiguous(self):
+        batch = OHLCVBatch(
+            [1, 2, 3], [1, 2, 3], [1, 2, 3], [1, 2, 3], [1, 2, 3], [1, 2, 3]
+        )
+
+        assert batch.timestamps.dtype == np.int64
+        assert all(column.dtype == np.float64 for column in batch.columns)
+        assert all(column.flags.c_contiguous for column in batch.columns)
+
+    def test_mismatched_lengths_raise(self):
+        with pytest.raises(ValueError):
+            OHLCVBatch([1, 2], [1], [1], [1], [1], [1])
+
+    def test_empty(self):
+        batch = OHLCVBatch.empty()
+
+        assert len(batch) == 0
+        assert batch.to_pandas().empty
+        with pytest.raises(ValueError):
+            batch.min_timestamp()
+
+    def test_min_and_max_timestamp(self):
+        batch = make_batch(4)[::-1]
+
+        assert batch.min_timestamp() == BASE
+        assert batch.max_timestamp() == BASE + timedelta(minutes=15)
+
+    def test_slicing_returns_views(self):
+        batch = make_batch(10)
+        part = batch[2:5]
+
+        assert len(part) == 3
+        assert np.shares_memory(part.close, batch.close)
+        assert part.min_timestamp() == BASE + timedelta(minutes=10)
+
+    def test_concat(self):
+        batch = OHLCVBatch.concat([make_batch(3), make_batch(2, start=3)])
+
+        assert len(batch) == 5
+        assert batch.volume.tolist() == [0, 1, 2, 3, 4]
+        assert len(OHLCVBatch.concat([])) == 0
+
+    def test_to_pandas_is_zero_copy(self):
+        batch = make_batch(5)
+        frame = batch.to_pandas()
+
+        assert list(frame.columns) == list(OHLCVBatch.COLUMNS)
+        assert str(frame.index.tz) == "UTC"
+        assert frame.index[0] == BASE
+        assert np.shares_memory(frame["close"].to_numpy(), batch.close)
+        assert np.shares_memory(frame.index.asi8, batch.timestamps)
+
+    def test_frame_round_trip(self):
+        batch = make_batch(5)
+        again = OHLCVBatch.from_frame(batch.to_pandas())
+
+        assert again.timestamps.tolist() == batch.timestamps.tolist()
+        assert again.close.tolist() == batch.close.tolist()
+
+    def test_models_round_trip(self):
+        models = [
+            OHLCVData(
+                timestamp=BASE + timedelta(minutes=5 * i),
+                open=Decimal("1.5"),
+                high=Decimal("2.25"),
+                low=Decimal("0.5"),
+                close=Decimal("1.75"),
+                volume=Decimal(i)
+            )
+            for i in range(3)
+        ]
+
+        batch = OHLCVBatch.from_models(models)
+        again = batch.to_models()
+
+        assert batch.min_timestamp() == BASE
+        assert again[1].timestamp == models[1].timestamp
+        assert again[1].high == Decimal("2.25")
+        assert again[2].volume == Decimal(2)
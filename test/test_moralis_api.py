@@ -1,15 +1,19 @@
 
 import os
 import json
+import asyncio
+import aiohttp
 import pytest
 import requests
+import numpy as np
+from urllib.parse import unquote
 from decimal import Decimal
 from datetime import datetime
-from unittest.mock import patch, Mock
+from unittest.mock import patch, AsyncMock, Mock
 
-from src.moralis_api import MoralisAPI
+from src.moralis_api import MoralisAPI, AsyncMoralisAPI
 from src.timeframe import Timeframe
-from src.model import OHLCVData
+from src.model import OHLCVBatch, OHLCVData
 
 BASE_MOCK_DIR = os.path.join(os.path.dirname(__file__), "mock_data")
 
@@ -37,7 +41,7 @@ def mock_requests_get(moralis_response_response_1):
     mock_response.json.return_value = moralis_response_response_1
     mock_response.raise_for_status.return_value = None
 
-    with patch("requests.get", return_value=mock_response):
+    with patch("requests.Session.send", return_value=mock_response):
         yield mock_response
 
 
@@ -57,7 +61,7 @@ class TestGetOHLCVData:
         mock_response.json.return_value = moralis_response_response_1
         mock_response.raise_for_status = Mock()
 
-        with patch("requests.get", return_value=mock_response):
+        with patch("requests.Session.send", return_value=mock_response):
             result = mock_moralis_api.get_ohlcv_data(
                 pair_address=pair_address,
                 timeframe=timeframe,
@@ -84,7 +88,7 @@ class TestGetOHLCVData:
             requests.exceptions.HTTPError("404 Client Error")
         )
 
-        with patch("requests.get", return_value=mock_response):
+        with patch("requests.Session.send", return_value=mock_response):
             with pytest.raises(requests.exceptions.HTTPError):
                 mock_moralis_api.get_ohlcv_data(
                     pair_address=pair_address,
@@ -94,6 +98,32 @@ class TestGetOHLCVData:
                     to_date=to_date
                 )
 
+    @patch("src.backoff.sleep", return_value=None)
+    def test_client_error_is_not_retried(self, mock_sleep, mock_moralis_api):
+        mock_response = Mock()
+        mock_response.status_code = 404
+        mock_response.headers = {}
+        mock_response.raise_for_status.side_effect = (
+            requests.exceptions.HTTPError(
+                "404 Client Error", response=mock_response
+            )
+        )
+
+        with patch(
+            "requests.Session.send", return_value=mock_response
+        ) as mock_send:
+            with pytest.raises(requests.exceptions.HTTPError):
+                mock_moralis_api.get_ohlcv_data(
+                    pair_address="dummy_pair",
+                    timeframe=Timeframe.MIN5,
+                    currency="usd",
+                    from_date=datetime(2024, 4, 20, 19, 0, 0),
+                    to_date=datetime(2024, 4, 20, 23, 30, 0)
+                )
+
+        assert mock_send.call_count == 1
+        mock_sleep.assert_not_called()
+
     @patch("src.backoff.sleep", return_value=None)
     def test_request_exception(self, mock_sleep, mock_moralis_api):
         pair_address = "dummy_pair"
@@ -103,7 +133,7 @@ class TestGetOHLCVData:
         to_date = datetime(2024, 4, 20, 23, 30, 0)
 
         with patch(
-            "requests.get",
+            "requests.Session.send",
             side_effect=requests.exceptions.RequestException("Network Error")
         ):
             with pytest.raises(requests.exceptions.RequestException):
@@ -127,7 +157,7 @@ class TestGetOHLCVData:
         mock_response.raise_for_status = Mock()
         mock_response.json.side_effect = ValueError("Malformed JSON")
 
-        with patch("requests.get", return_value=mock_response):
+        with patch("requests.Session.send", return_value=mock_response):
             with pytest.raises(ValueError):
                 mock_moralis_api.get_ohlcv_data(
                     pair_address=pair_address,
@@ -169,7 +199,7 @@ class TestGetOHLCVData:
         mock_response.raise_for_status = Mock()
         mock_response.json.return_value = sample_data
 
-        with patch("requests.get", return_value=mock_response):
+        with patch("requests.Session.send", return_value=mock_response):
             result = mock_moralis_api.get_ohlcv_data(
                 pair_address=pair_address,
                 timeframe=timeframe,
@@ -205,7 +235,7 @@ class TestGetOHLCVData:
         mock_response.raise_for_status = Mock()
         mock_response.json.return_value = sample_data
 
-        with patch("requests.get", return_value=mock_response):
+        with patch("requests.Session.send", return_value=mock_response):
             result = mock_moralis_api.get_ohlcv_data(
                 pair_address=pair_address,
                 timeframe=timeframe,
@@ -252,7 +282,7 @@ class TestGetOHLCVData:
         mock_response.raise_for_status = Mock()
         mock_response.json.return_value = sample_data
 
-        with patch("requests.get", return_value=mock_response):
+        with patch("requests.Session.send", return_value=mock_response):
             result = mock_moralis_api.get_ohlcv_data(
                 pair_address=pair_address,
                 timeframe=timeframe,
@@ -282,7 +312,7 @@ class TestGetOHLCVData:
         mock_response.raise_for_status = Mock()
         mock_response.json.return_value = sample_data
 
-        with patch("requests.get", return_value=mock_response):
+        with patch("requests.Session.send", return_value=mock_response):
             result = mock_moralis_api.get_ohlcv_data(
                 pair_address=pair_address,
                 timeframe=timeframe,
@@ -307,31 +337,324 @@ class TestGetOHLCVData:
         mock_response.raise_for_status = Mock()
         mock_response.json.return_value = sample_data
 
-        with patch("requests.get", return_value=mock_response):
-            with patch("requests.Request.prepare") as mock_prepare:
-                dummy_prepared = Mock()
+        with patch(
+            "requests.Session.send", return_value=mock_response
+        ) as mock_send:
+            mock_moralis_api.get_ohlcv_data(
+                pair_address=pair_address,
+                timeframe=timeframe,
+                currency=currency,
+                from_date=from_date,
+                to_date=to_date
+            )
+
+        url = unquote(mock_send.call_args.args[0].url)
+        assert from_date.isoformat() in url, (
+            "fromDate parameter missing or incorrect in URL."
+        )
+        assert to_date.isoformat() in url, (
+            "toDate parameter missing or incorrect in URL."
+        )
+
+
+class TestGetOHLCVFrame:
+    def fetch(self, api, payload, float64):
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = payload
+
+        with patch("requests.Session.send", return_value=mock_response):
+            return api.get_ohlcv_frame(
+                pair_address="dummy_pair",
+                timeframe=Timeframe.MIN30,
+                currency="usd",
+                from_date=datetime(2025, 4, 20, 0, 0, 0),
+                to_date=datetime(2025, 4, 21, 0, 0, 0),
+                float64=float64
+            )
+
+    def test_float64_columns(
+        self, mock_moralis_api, moralis_response_response_1
+    ):
+        frame = self.fetch(
+            mock_moralis_api, moralis_response_response_1, float64=True
+        )
+
+        result = moralis_response_response_1["result"]
+        assert len(frame) == len(result)
+        assert list(frame.columns) == [
+            "open", "high", "low", "close", "volume"
+        ]
+        assert all(dtype == np.float64 for dtype in frame.dtypes)
+        assert str(frame.index.tz) == "UTC"
+        assert frame["open"].iloc[0] == float(result[0]["open"])
+
+    def test_decimal_columns_by_default(
+        self, mock_moralis_api, moralis_response_response_1
+    ):
+        frame = self.fetch(
+            mock_moralis_api, moralis_response_response_1, float64=False
+        )
+
+        first = moralis_response_response_1["result"][0]
+        assert frame["open"].iloc[0] == Decimal(first["open"])
+
+    def test_invalid_entries_are_dropped_per_batch(self, mock_moralis_api):
+        payload = {"result": [
+            {
+                "timestamp": "2025-04-20T20:00:00.000Z",
+                "open": "1.0", "high": "2.0", "low": "0.5",
+                "close": "1.5", "volume": "100.0"
+            }, {
+                "timestamp": "2025-04-20T20:30:00.000Z",
+                "open": "1.0", "high": "2.0", "low": "0.5",
+                "close": "NaN", "volume": "100.0"
+            }, {
+                "timestamp": "2025-04-20T21:00:00.000Z",
+                "high": "2.0", "low": "0.5",
+                "close": "1.5", "volume": "100.0"
+            }
+        ]}
+
+        frame = self.fetch(mock_moralis_api, payload, float64=True)
+
+        assert len(frame) == 1
+        assert frame.index[0].hour == 20
+
+    def test_empty_result(self, mock_moralis_api):
+        frame = self.fetch(mock_moralis_api, {"result": []}, float64=True)
+
+        assert frame.empty
+
+    def test_get_ohlcv_batch(
+        self, mock_moralis_api, moralis_response_response_1
+    ):
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = moralis_response_response_1
+
+        with patch("requests.Session.send", return_value=mock_response):
+            batch = mock_moralis_api.get_ohlcv_batch(
+                pair_address="dummy_pair",
+                timeframe=Timeframe.MIN30,
+                currency="usd",
+                from_date=datetime(2025, 4, 20, 0, 0, 0),
+                to_date=datetime(2025, 4, 21, 0, 0, 0)
+            )
+
+        first = moralis_response_response_1["result"][0]
+        assert isinstance(batch, OHLCVBatch)
+        assert len(batch) == len(moralis_response_response_1["result"])
+        assert batch.max_timestamp() == datetime.fromisoformat(
+            first["timestamp"]
+        )
+        assert batch.open[0] == float(first["open"])
+
+    @pytest.mark.parametrize("payload_cursor, expected", [
+        ("abc123", "abc123"), ("", None), (None, None)
+    ])
+    def test_get_ohlcv_page_returns_cursor(
+        self, mock_moralis_api, moralis_response_response_1,
+        payload_cursor, expected
+    ):
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            **moralis_response_response_1, "cursor": payload_cursor
+        }
+
+        with patch(
+            "requests.Session.send", return_value=mock_response
+        ) as send:
+            batch, cursor = mock_moralis_api.get_ohlcv_page(
+                pair_address="dummy_pair",
+                timeframe=Timeframe.MIN30,
+                currency="usd",
+                from_date=datetime(2025, 4, 20, 0, 0, 0),
+                to_date=datetime(2025, 4, 21, 0, 0, 0),
+                limit=1000,
+                cursor="prev"
+            )
 
-                def fake_prepare():
-                    dummy_prepared.url = (
-                        f"https://example.com"
-                        f"?fromDate={from_date.isoformat()}"
-                        f"&toDate={to_date.isoformat()}"
-                    )
-                    return dummy_prepared
-                mock_prepare.side_effect = fake_prepare
+        assert cursor == expected
+        assert len(batch) == len(moralis_response_response_1["result"])
+        url = send.call_args.args[0].url
+        assert "limit=1000" in url
+        assert "cursor=prev" in url
 
+
+class TestConnectionPooling:
+    def test_requests_share_one_session(self, mock_moralis_api):
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"result": []}
+
+        with patch.object(
+            mock_moralis_api._session, "send", return_value=mock_response
+        ) as mock_send:
+            for _ in range(3):
                 mock_moralis_api.get_ohlcv_data(
-                    pair_address=pair_address,
-                    timeframe=timeframe,
-                    currency=currency,
-                    from_date=from_date,
-                    to_date=to_date
+                    pair_address="dummy_pair",
+                    timeframe=Timeframe.MIN5,
+                    currency="usd",
+                    from_date=datetime(2024, 4, 20, 19, 0, 0),
+                    to_date=datetime(2024, 4, 20, 23, 30, 0)
                 )
 
-                url = dummy_prepared.url
-                assert from_date.isoformat() in url, (
-                    "fromDate parameter missing or incorrect in URL."
+        assert mock_send.call_count == 3
+        assert mock_send.call_args.kwargs["timeout"] == (5.0, 30.0)
+
+    def test_pool_size_and_timeouts_are_configurable(self):
+        api = MoralisAPI(pool_maxsize=32, connect_timeout=1, read_timeout=2)
+        adapter = api._session.get_adapter("https://example.com")
+
+        assert adapter._pool_maxsize == 32
+        assert api._timeout == (1, 2)
+        api.close()
+
+    def test_request_is_prepared_once(self, mock_moralis_api):
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"result": []}
+
+        with patch("requests.Session.send", return_value=mock_response):
+            with patch(
+                "requests.Session.prepare_request",
+                wraps=mock_moralis_api._session.prepare_request
+            ) as mock_prepare:
+                mock_moralis_api.get_ohlcv_data(
+                    pair_address="dummy_pair",
+                    timeframe=Timeframe.MIN5,
+                    currency="usd",
+                    from_date=datetime(2024, 4, 20, 19, 0, 0),
+                    to_date=datetime(2024, 4, 20, 23, 30, 0)
                 )
-                assert to_date.isoformat() in url, (
-                    "toDate parameter missing or incorrect in URL."
+
+        mock_prepare.assert_called_once()
+
+    def test_rate_limiter_is_acquired_per_request(self):
+        limiter = Mock()
+        api = MoralisAPI(rate_limiter=limiter)
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"result": []}
+
+        with patch("requests.Session.send", return_value=mock_response):
+            for _ in range(2):
+                api.get_ohlcv_data(
+                    pair_address="dummy_pair",
+                    timeframe=Timeframe.MIN5,
+                    currency="usd",
+                    from_date=datetime(2024, 4, 20, 19, 0, 0),
+                    to_date=datetime(2024, 4, 20, 23, 30, 0)
                 )
+
+        assert limiter.acquire.call_count == 2
+
+
+class FakeResponse:
+    def __init__(self, status, payload):
+        self.status = status
+        self.headers = {}
+        self.url = "https://example.com"
+        self._payload = payload
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    async def text(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status != 200:
+            raise aiohttp.ClientResponseError(
+                Mock(real_url="https://example.com"), (), status=self.status
+            )
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.closed = False
+        self.calls = []
+        self._responses = list(responses)
+
+    def get(self, url, params=None, headers=None):
+        self.calls.append((url, params, headers))
+        return self._responses.pop(0)
+
+    async def close(self):
+        self.closed = True
+
+
+class TestAsyncGetOHLCVData:
+    def fetch(self, session):
+        api = AsyncMoralisAPI(session=session)
+        return asyncio.run(api.get_ohlcv_data(
+            pair_address="dummy_pair",
+            timeframe=Timeframe.MIN5,
+            currency="usd",
+            from_date=datetime(2024, 4, 20, 19, 0, 0),
+            to_date=datetime(2024, 4, 20, 23, 30, 0)
+        ))
+
+    def test_successful_response(self, moralis_response_response_1):
+        session = FakeSession(
+            [FakeResponse(200, json.dumps(moralis_response_response_1))]
+        )
+
+        result = self.fetch(session)
+
+        assert result
+        assert isinstance(result[0], OHLCVData)
+        url, params, headers = session.calls[0]
+        assert url.endswith("/dummy_pair/ohlcv")
+        assert params["timeframe"] == "5min"
+        assert params["limit"] == "100"
+        assert headers == {"X-API-Key": "dummy_api_key"}
+
+    @patch("src.backoff.async_sleep")
+    def test_retries_server_errors(
+        self, mock_sleep, moralis_response_response_1
+    ):
+        session = FakeSession([
+            FakeResponse(500, "oops"),
+            FakeResponse(200, json.dumps(moralis_response_response_1))
+        ])
+
+        assert self.fetch(session)
+        assert len(session.calls) == 2
+        mock_sleep.assert_awaited_once()
+
+    def test_malformed_json(self):
+        session = FakeSession([FakeResponse(200, "not json")])
+
+        with pytest.raises(ValueError):
+            self.fetch(session)
+        assert len(session.calls) == 1
+
+    def test_rate_limiter_is_acquired_per_request(self):
+        limiter = Mock()
+        limiter.acquire_async = AsyncMock()
+        session = FakeSession([FakeResponse(200, '{"result": []}')])
+        api = AsyncMoralisAPI(session=session, rate_limiter=limiter)
+
+        asyncio.run(api.get_ohlcv_data(
+            pair_address="dummy_pair",
+            timeframe=Timeframe.MIN5,
+            currency="usd",
+            from_date=datetime(2024, 4, 20, 19, 0, 0),
+            to_date=datetime(2024, 4, 20, 23, 30, 0)
+        ))
+
+        limiter.acquire_async.assert_awaited_once()
+
+    def test_close_closes_owned_session(self):
+        session = FakeSession([])
+        api = AsyncMoralisAPI(session=session)
+
+        asyncio.run(api.close())
+
+        assert session.closed
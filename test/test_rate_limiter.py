@@ -0,0 +1,110 @@
+import asyncio
+import pytest
+import multiprocessing
+
+from src.rate_limiter import RateLimiter, FileRateLimiter
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+        self.sleeps = []
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr("src.rate_limiter.monotonic", lambda: clock.now)
+    monkeypatch.setattr("src.rate_limiter.time", lambda: clock.now)
+    monkeypatch.setattr("src.rate_limiter.sleep", clock.sleep)
+    return clock
+
+
+def hammer(path, count):
+    limiter = FileRateLimiter(path, rate=1, burst=1)
+    waits = [limiter.reserve() for _ in range(count)]
+    limiter.close()
+    return waits
+
+
+class TestRateLimiter:
+    @pytest.mark.parametrize("rate, burst", [(0, 1), (-1, 1), (1, 0)])
+    def test_invalid_settings_raise(self, rate, burst):
+        with pytest.raises(ValueError):
+            RateLimiter(rate, burst)
+
+    def test_burst_is_free(self, clock):
+        limiter = RateLimiter(rate=10, burst=3)
+
+        for _ in range(3):
+            limiter.acquire()
+
+        assert clock.sleeps == []
+
+    def test_waits_after_burst(self, clock):
+        limiter = RateLimiter(rate=10, burst=2)
+
+        for _ in range(4):
+            limiter.acquire()
+
+        assert clock.sleeps == pytest.approx([0.1, 0.1])
+
+    def test_reservations_queue_up(self, clock):
+        limiter = RateLimiter(rate=2, burst=1)
+
+        waits = [limiter.reserve() for _ in range(3)]
+
+        assert waits == pytest.approx([0, 0.5, 1.0])
+
+    def test_tokens_refill_up_to_burst(self, clock):
+        limiter = RateLimiter(rate=1, burst=2)
+        limiter.reserve()
+        limiter.reserve()
+
+        clock.now += 60
+
+        assert [limiter.reserve() for _ in range(3)] == pytest.approx(
+            [0, 0, 1]
+        )
+
+    def test_acquire_async(self, clock, monkeypatch):
+        delays = []
+
+        async def fake_sleep(seconds):
+            delays.append(seconds)
+        monkeypatch.setattr("src.rate_limiter.asyncio.sleep", fake_sleep)
+        limiter = RateLimiter(rate=4, burst=1)
+
+        async def run():
+            await limiter.acquire_async()
+            await limiter.acquire_async()
+
+        asyncio.run(run())
+
+        assert delays == pytest.approx([0.25])
+
+
+class TestFileRateLimiter:
+    def test_state_is_shared_between_instances(self, clock, tmp_path):
+        first = FileRateLimiter(tmp_path / "bucket", rate=2, burst=1)
+        second = FileRateLimiter(tmp_path / "bucket", rate=2, burst=1)
+
+        waits = [first.reserve(), second.reserve(), first.reserve()]
+        first.close()
+        second.close()
+
+        assert waits == pytest.approx([0, 0.5, 1.0])
+
+    def test_state_is_shared_between_processes(self, tmp_path):
+        path = tmp_path / "bucket"
+        ctx = multiprocessing.get_context("fork")
+        with ctx.Pool(2) as pool:
+            results = pool.starmap(hammer, [(path, 5), (path, 5)])
+
+        waits = sorted(w for result in results for w in result)
+        assert waits[0] == pytest.approx(0, abs=0.5)
+        assert waits[-1] == pytest.approx(9, abs=1)
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from src.model import OHLCVBatch
+from src.resample import can_resample, resample_batch, resample_sources
+from src.timeframe import Timeframe
+
+BASE = datetime(2024, 4, 20, 19, 0, 0, tzinfo=timezone.utc)
+MINUTE = 60 * 1_000_000_000
+
+
+def make_batch(minutes):
+    start = int(BASE.timestamp()) * 1_000_000_000
+    count = len(minutes)
+    values = np.arange(count, dtype=np.float64)
+    return OHLCVBatch(
+        np.array([start + m * MINUTE for m in minutes], dtype=np.int64),
+        values, values + 10, values - 10, values + 0.5, np.ones(count)
+    )
+
+
+class TestCanResample:
+    @pytest.mark.parametrize("source, target, expected", [
+        (Timeframe.MIN1, Timeframe.H1, True),
+        (Timeframe.MIN5, Timeframe.MIN30, True),
+        (Timeframe.S10, Timeframe.MIN1, True),
+        (Timeframe.MIN10, Timeframe.H4, True),
+        (Timeframe.H1, Timeframe.MIN5, False),
+        (Timeframe.H1, Timeframe.H1, False),
+        (Timeframe.S30, Timeframe.S10, False),
+        (Timeframe.H1, Timeframe.W1, False),
+        (Timeframe.D1, Timeframe.M1, False),
+    ])
+    def test_ratio_rules(self, source, target, expected):
+        assert can_resample(source, target) is expected
+
+    def test_sources_are_coarsest_first(self):
+        sources = resample_sources(Timeframe.H1)
+
+        assert sources[0] == Timeframe.MIN30
+        assert sources[-1] == Timeframe.S1
+        assert Timeframe.H1 not in sources
+
+
+class TestResampleBatch:
+    def test_aggregates_ohlcv(self):
+        batch = make_batch(range(10))
+
+        result = resample_batch(batch, Timeframe.MIN5)
+
+        assert len(result) == 2
+        assert result.min_timestamp() == BASE
+        assert result.max_timestamp() == BASE + timedelta(minutes=5)
+        np.testing.assert_array_equal(result.open, [0, 5])
+        np.testing.assert_array_equal(result.high, [14, 19])
+        np.testing.assert_array_equal(result.low, [-10, -5])
+        np.testing.assert_array_equal(result.close, [4.5, 9.5])
+        np.testing.assert_array_equal(result.volume, [5, 5])
+
+    def test_sparse_buckets_are_aligned(self):
+        batch = make_batch([3, 4, 17])
+
+        result = resample_batch(batch, Timeframe.MIN10)
+
+        np.testing.assert_array_equal(
+            result.timestamps - result.timestamps[0], [0, 10 * MINUTE]
+        )
+        np.testing.assert_array_equal(result.close, [1.5, 2.5])
+
+    def test_unsorted_input_is_sorted_first(self):
+        batch = make_batch([0, 1, 2])[np.array([2, 0, 1])]
+
+        result = resample_batch(batch, Timeframe.MIN5)
+
+        assert result.open[0] == 0
+        assert result.close[0] == 2.5
+
+    def test_empty_batch(self):
+        assert len(resample_batch(OHLCVBatch.empty(), Timeframe.H1)) == 0
+
+    def test_calendar_target_raises(self):
+        with pytest.raises(ValueError):
+            resample_batch(make_batch([0]), Timeframe.W1)
@@ -32,3 +32,8 @@ class TestTimeframe:
     ])
     def test_pandas_freq_property(self, tf, expected):
         assert tf.pandas_freq == expected
+
+    def test_label_property(self):
+        assert Timeframe.S10.label == "10s"
+        assert Timeframe.MIN5.label == "5min"
+        assert Timeframe.M1.label == "1m"
@@ -1,3 +1,220 @@
+import pytest
+import numpy as np
+from decimal import Decimal
+from datetime import datetime, timedelta, timezone
 
-# import pytest
-# from src.warehouse import OHLCVWarehouse
+from src.warehouse import OHLCVWarehouse
+from src.timeframe import Timeframe
+from src.model import OHLCVBatch, OHLCVData
+
+PAIR = "dummy_pair"
+BASE = datetime(2024, 4, 20, 19, 0, 0, tzinfo=timezone.utc)
+
+
+def make_candles(count, step=timedelta(minutes=5), start=BASE, close=1):
+    return [
+        OHLCVData(
+            timestamp=start + i * step,
+            open=Decimal("1.0"),
+            high=Decimal("2.0"),
+            low=Decimal("0.5"),
+            close=Decimal(close),
+            volume=Decimal(i)
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def warehouse(tmp_path):
+    return OHLCVWarehouse(tmp_path / "ohlcv")
+
+
+class TestOHLCVWarehouse:
+    def test_load_missing_partition_is_empty(self, warehouse):
+        df = warehouse.load_ohlcv_data(
+            PAIR, Timeframe.MIN5, BASE, BASE + timedelta(hours=1)
+        )
+        assert df.empty
+        assert list(df.columns) == ["open", "high", "low", "close", "volume"]
+
+    def test_store_and_load_round_trip(self, warehouse):
+        warehouse.store_ohlcv_data(PAIR, Timeframe.MIN5, make_candles(12))
+
+        df = warehouse.load_ohlcv_data(
+            PAIR, Timeframe.MIN5, BASE, BASE + timedelta(hours=1)
+        )
+        assert len(df) == 12
+        assert df.index[0] == BASE
+        assert str(df.index.tz) == "UTC"
+        assert df["volume"].dtype == np.float64
+        assert df["volume"].tolist() == list(range(12))
+
+    def test_range_bounds_are_inclusive(self, warehouse):
+        warehouse.store_ohlcv_data(PAIR, Timeframe.MIN5, make_candles(12))
+
+        df = warehouse.load_ohlcv_data(
+            PAIR, Timeframe.MIN5,
+            BASE + timedelta(minutes=10), BASE + timedelta(minutes=20)
+        )
+        assert df["volume"].tolist() == [2, 3, 4]
+
+    def test_upsert_is_idempotent(self, warehouse):
+        candles = make_candles(12)
+        warehouse.store_ohlcv_data(PAIR, Timeframe.MIN5, candles)
+        warehouse.store_ohlcv_data(PAIR, Timeframe.MIN5, candles)
+
+        df = warehouse.load_ohlcv_data(
+            PAIR, Timeframe.MIN5, BASE, BASE + timedelta(hours=1)
+        )
+        assert len(df) == 12
+        assert df.index.is_monotonic_increasing
+
+    def test_upsert_replaces_existing_rows(self, warehouse):
+        warehouse.store_ohlcv_data(PAIR, Timeframe.MIN5, make_candles(12))
+        warehouse.store_ohlcv_data(
+            PAIR, Timeframe.MIN5, make_candles(2, close=7)
+        )
+
+        df = warehouse.load_ohlcv_data(
+            PAIR, Timeframe.MIN5, BASE, BASE + timedelta(hours=1)
+        )
+        assert len(df) == 12
+        assert df["close"].tolist()[:3] == [7, 7, 1]
+
+    def test_unordered_input_is_sorted(self, warehouse):
+        candles = make_candles(6)
+        warehouse.store_ohlcv_data(PAIR, Timeframe.MIN5, candles[::-1])
+
+        df = warehouse.load_ohlcv_data(
+            PAIR, Timeframe.MIN5, BASE, BASE + timedelta(hours=1)
+        )
+        assert df["volume"].tolist() == list(range(6))
+
+    def test_naive_bounds_are_treated_as_utc(self, warehouse):
+        warehouse.store_ohlcv_data(PAIR, Timeframe.MIN5, make_candles(12))
+
+        df = warehouse.load_ohlcv_data(
+            PAIR, Timeframe.MIN5,
+            datetime(2024, 4, 20, 19, 0), datetime(2024, 4, 20, 19, 5)
+        )
+        assert len(df) == 2
+
+    def test_partitions_are_keyed_by_pair_and_timeframe(self, warehouse):
+        warehouse.store_ohlcv_data(PAIR, Timeframe.MIN5, make_candles(3))
+
+        end = BASE + timedelta(hours=1)
+        assert warehouse.load_ohlcv_data(
+            "other_pair", Timeframe.MIN5, BASE, end
+        ).empty
+        assert warehouse.load_ohlcv_data(
+            PAIR, Timeframe.MIN1, BASE, end
+        ).empty
+
+    def test_store_accepts_batches(self, warehouse):
+        warehouse.store_ohlcv_data(
+            PAIR, Timeframe.MIN5, OHLCVBatch.from_models(make_candles(5))
+        )
+
+        df = warehouse.load_ohlcv_data(
+            PAIR, Timeframe.MIN5, BASE, BASE + timedelta(hours=1)
+        )
+        assert df["volume"].tolist() == list(range(5))
+
+    def test_data_persists_across_instances(self, tmp_path):
+        OHLCVWarehouse(tmp_path).store_ohlcv_data(
+            PAIR, Timeframe.MIN5, make_candles(4)
+        )
+
+        df = OHLCVWarehouse(tmp_path).load_ohlcv_data(
+            PAIR, Timeframe.MIN5, BASE, BASE + timedelta(hours=1)
+        )
+        assert len(df) == 4
+
+    def test_store_listeners_receive_written_range(self, warehouse):
+        calls = []
+        warehouse.add_store_listener(lambda *args: calls.append(args))
+
+        warehouse.store_ohlcv_data(PAIR, Timeframe.MIN5, make_candles(3))
+        warehouse.store_ohlcv_data(PAIR, Timeframe.MIN5, [])
+
+        start = int(BASE.timestamp()) * 1_000_000_000
+        assert calls == [(
+            PAIR, Timeframe.MIN5, start, start + 10 * 60 * 1_000_000_000
+        )]
+
+
+class TestOHLCVWarehouseMmap:
+    @pytest.fixture
+    def mmap_warehouse(self, tmp_path):
+        return OHLCVWarehouse(tmp_path / "ohlcv", mmap=True)
+
+    def test_loads_are_views_into_the_mapping(self, mmap_warehouse):
+        mmap_warehouse.store_ohlcv_data(PAIR, Timeframe.MIN5, make_candles(12))
+        end = BASE + timedelta(hours=1)
+
+        first = mmap_warehouse.load_ohlcv_data(PAIR, Timeframe.MIN5, BASE, end)
+        second = mmap_warehouse.load_ohlcv_data(
+            PAIR, Timeframe.MIN5, BASE + timedelta(minutes=10), end
+        )
+
+        volume = first["volume"].to_numpy()
+        assert not volume.flags.writeable
+        assert np.shares_memory(volume, second["volume"].to_numpy())
+        assert np.shares_memory(
+            first.index.asi8, second.index.asi8
+        )
+        assert second.index[0] == BASE + timedelta(minutes=10)
+
+    def test_matches_copying_mode(self, tmp_path, mmap_warehouse):
+        mmap_warehouse.store_ohlcv_data(PAIR, Timeframe.MIN5, make_candles(12))
+        end = BASE + timedelta(hours=1)
+
+        mapped = mmap_warehouse.load_ohlcv_data(
+            PAIR, Timeframe.MIN5, BASE, end
+        )
+        copied = OHLCVWarehouse(tmp_path / "ohlcv").load_ohlcv_data(
+            PAIR, Timeframe.MIN5, BASE, end
+        )
+        assert mapped.equals(copied)
+
+    def test_remaps_after_store(self, mmap_warehouse):
+        end = BASE + timedelta(hours=1)
+        mmap_warehouse.store_ohlcv_data(PAIR, Timeframe.MIN5, make_candles(2))
+        before = mmap_warehouse.load_ohlcv_data(
+            PAIR, Timeframe.MIN5, BASE, end
+        )
+
+        mmap_warehouse.store_ohlcv_data(PAIR, Timeframe.MIN5, make_candles(12))
+        after = mmap_warehouse.load_ohlcv_data(
+            PAIR, Timeframe.MIN5, BASE, end
+        )
+
+        assert len(before) == 2
+        assert len(after) == 12
+
+
+class TestOHLCVWarehouseCoverage:
+    def test_uncovered_partition_is_missing(self, warehouse):
+        end = BASE + timedelta(hours=1)
+        assert warehouse.missing_spans(PAIR, Timeframe.MIN5, BASE, end) == [
+            (BASE, end)
+        ]
+
+    def test_mark_covered_persists(self, tmp_path):
+        end = BASE + timedelta(hours=1)
+        OHLCVWarehouse(tmp_path).mark_covered(
+            PAIR, Timeframe.MIN5, BASE, BASE + timedelta(minutes=20)
+        )
+
+        assert OHLCVWarehouse(tmp_path).missing_spans(
+            PAIR, Timeframe.MIN5, BASE, end
+        ) == [(BASE + timedelta(minutes=20), end)]
+
+    def test_coverage_is_keyed_by_pair_and_timeframe(self, warehouse):
+        end = BASE + timedelta(hours=1)
+        warehouse.mark_covered(PAIR, Timeframe.MIN5, BASE, end)
+
+        assert warehouse.missing_spans(PAIR, Timeframe.MIN5, BASE, end) == []
+        assert warehouse.missing_spans(PAIR, Timeframe.MIN1, BASE, end)
+        assert warehouse.missing_spans("other_pair", Timeframe.MIN5, BASE, end)